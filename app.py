@@ -1,10 +1,27 @@
+import uuid
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from streamlit_option_menu import option_menu
 
+from promethee.cache import CacheLRU, hash_frame
+from promethee.config import KRITERIA_CONFIG, RUBRIK_PENILAIAN
+from promethee.gaia import promethee_i, proyeksi_gaia, tak_terbandingkan_dengan, tongkat_keputusan
+from promethee.grafik import TOP_N, buat_grafik_flow, buat_grafik_gaia, buat_grafik_peringkat, buat_grafik_radar, mode_besar
+from promethee.incremental import FlowInkremental, tanda_tangan_config
+from promethee.insight import generate_insight
+from promethee.profiling import Profiler, aktif_dari_env
+from promethee.ingest import EKSTENSI, FileTidakValid, baca_upload
+from promethee.jobs import BATAL, GAGAL, SELESAI, AntrianPenuh, JobRunner, kunci_job
+from promethee.robustness import MAKS_N_GANGGUAN_SKOR, MAKS_PERINGKAT, robustness_bertahap
+from promethee.sensitivitas import evaluator_bobot
+from promethee.shared import DatasetStore
+from promethee.store import SkenarioStore, diff_skenario
+
 # ==========================================
 # 1. SETUP HALAMAN & TEMA
 # ==========================================
@@ -77,43 +94,13 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# --- PROFILER (aktif via ?debug=1 atau env SPK_PROFILE=1; alokasi memori hanya diukur dengan SPK_PROFILE=1) ---
+profiler = Profiler(aktif=aktif_dari_env() or st.query_params.get("debug") == "1")
+
 # ==========================================
 # 2. CONFIG DATA & RUBRIK PENILAIAN
 # ==========================================
-KRITERIA_CONFIG = {
-    'C1':  {'nama': 'Skala Prod',     'tipe': 'max', 'bobot': 0.0225, 'q': 5,  'p': 20},
-    'C2':  {'nama': 'Kebutuhan Market',      'tipe': 'max', 'bobot': 0.1035, 'q': 5,  'p': 20},
-    'C3':  {'nama': 'Profitabilitas', 'tipe': 'max', 'bobot': 0.1440, 'q': 5,  'p': 20}, 
-    'C4':  {'nama': 'COGS (Biaya)',   'tipe': 'min', 'bobot': 0.1845, 'q': 5,  'p': 20}, 
-    'C5':  {'nama': 'Coal Supply Chain',    'tipe': 'min', 'bobot': 0.0385, 'q': 5,  'p': 20}, 
-    'C6':  {'nama': 'Perizinan',      'tipe': 'max', 'bobot': 0.1155, 'q': 2,  'p': 10},
-    'C7':  {'nama': 'Kondisi Geo',    'tipe': 'max', 'bobot': 0.1960, 'q': 5,  'p': 20},
-    'C8':  {'nama': 'RTRW',           'tipe': 'max', 'bobot': 0.0090, 'q': 2,  'p': 10},
-    'C9':  {'nama': 'Karakteristik Geologi',  'tipe': 'max', 'bobot': 0.0255, 'q': 2,  'p': 10},
-    'C10': {'nama': 'Sosial Masyarakat',     'tipe': 'max', 'bobot': 0.0420, 'q': 2,  'p': 10},
-    'C11': {'nama': 'Permit Lingkungan',    'tipe': 'max', 'bobot': 0.0750, 'q': 2,  'p': 10},
-    'C12': {'nama': 'Sektor Bisnis Lainnya',  'tipe': 'max', 'bobot': 0.0035, 'q': 2,  'p': 10},
-    'C13': {'nama': 'Rencana Perusahaan',      'tipe': 'max', 'bobot': 0.0165, 'q': 2,  'p': 10},
-    'C14': {'nama': 'Relasi',         'tipe': 'max', 'bobot': 0.0300, 'q': 2,  'p': 10},
-}
-
-RUBRIK_PENILAIAN = {
-    'C1': {'Low': 'Kapasitas Kecil (Cadangan Minim)', 'Mid': 'Kapasitas Sedang (5-10 Thn)', 'High': 'Kapasitas Besar (>10 Thn)'},
-    'C2': {'Low': 'Sulit Dijual (Low Rank <3000)', 'Mid': 'Pasar Domestik (Std PLN)', 'High': 'Premium/Ekspor (>4500)'},
-    'C3': {'Low': 'Rugi / Margin Negatif', 'Mid': 'Margin Tipis / Sensitif', 'High': 'Sangat Untung (High NPM)'},
-    'C4': {'Low': 'Biaya MAHAL (Hauling Jauh)', 'Mid': 'Biaya WAJAR (Avg Industry)', 'High': 'Biaya MURAH (Efisien)'},
-    'C5': {'Low': 'Rantai RUMIT (Double Handling)', 'Mid': 'Standar (Hambatan Minor)', 'High': 'SEDERHANA (Pit-to-port lancar)'},
-    'C6': {'Low': 'Belum Ada / Bermasalah', 'Mid': 'Proses Berjalan', 'High': 'Lengkap (CnC)'},
-    'C7': {'Low': 'Kompleks (SR Tinggi >10)', 'Mid': 'Ekonomis (SR 5-8)', 'High': 'Sangat Baik (SR <4)'},
-    'C8': {'Low': 'Hutan Lindung / Konflik', 'Mid': 'Butuh Izin Khusus', 'High': 'Area Putih (APL)'},
-    'C9': {'Low': 'Pencemaran Tinggi', 'Mid': 'Terdampak Sedang', 'High': 'Aman / Jauh Pemukiman'},
-    'C10': {'Low': 'Konflik / Demo Warga', 'Mid': 'Kondusif (Berbayar)', 'High': 'Sangat Mendukung'},
-    'C11': {'Low': 'Amdal Belum Ada', 'Mid': 'Dalam Revisi', 'High': 'Amdal Lengkap'},
-    'C12': {'Low': 'Baru Merintis', 'Mid': 'Pemain Lama', 'High': 'Market Leader'},
-    'C13': {'Low': 'Tidak Jelas / Spekulatif', 'Mid': 'Ada tapi Belum Detail', 'High': 'Matang & Terstruktur'},
-    'C14': {'Low': 'Tidak Dikenal', 'Mid': 'Relasi Biasa', 'High': 'Relasi Kuat / Strategis'}
-}
-
+# KRITERIA_CONFIG & RUBRIK_PENILAIAN ada di promethee/config.py (dipakai bersama CLI)
 def get_rubrik_df():
     data = []
     for kode, desc in RUBRIK_PENILAIAN.items():
@@ -129,56 +116,160 @@ def get_rubrik_df():
 # ==========================================
 # 3. CORE LOGIC
 # ==========================================
-def hitung_promethee(df):
-    data = df.copy()
-    alternatives = data.index
-    criteria = list(KRITERIA_CONFIG.keys())
-    n = len(alternatives)
-    total_bobot = sum(k['bobot'] for k in KRITERIA_CONFIG.values())
-    preference_matrix = np.zeros((n, n))
-    
-    for k in criteria:
-        if k not in data.columns: continue
-        params = KRITERIA_CONFIG[k]
-        col_data = pd.to_numeric(data[k], errors='coerce').fillna(0).values
-        w = params['bobot'] / total_bobot if total_bobot > 0 else 0
-        q, p = params['q'], params['p']
-        is_max = params['tipe'] == 'max'
-        
-        for i in range(n):
-            for j in range(n):
-                if i == j: continue
-                val_i, val_j = col_data[i], col_data[j]
-                d = (val_i - val_j) if is_max else (val_j - val_i)
-                pref = 0
-                if d <= q: pref = 0
-                elif d > p: pref = 1
-                else: pref = (d - q) / (p - q)
-                preference_matrix[i, j] += pref * w
-
-    phi_plus = preference_matrix.sum(axis=1) / (n - 1)
-    phi_minus = preference_matrix.sum(axis=0) / (n - 1)
-    phi_net = phi_plus - phi_minus
-    
-    hasil = pd.DataFrame({'Net Flow': phi_net, 'Leaving (+)': phi_plus, 'Entering (-)': phi_minus}, index=alternatives)
-    return hasil.sort_values(by='Net Flow', ascending=False)
-
-def generate_insight(df, winner_name):
-    df_norm = df.copy()
-    for col in df_norm.columns:
-        if col in KRITERIA_CONFIG:
-            is_max = KRITERIA_CONFIG[col]['tipe'] == 'max'
-            if is_max:
-                df_norm[col] = (df[col] - df[col].min()) / (df[col].max() - df[col].min()) if (df[col].max() - df[col].min()) != 0 else 0
-            else:
-                df_norm[col] = (df[col].max() - df[col]) / (df[col].max() - df[col].min()) if (df[col].max() - df[col].min()) != 0 else 0
-    
-    winner_scores = df_norm.loc[winner_name]
-    top_3 = winner_scores.nlargest(3).index.tolist()
-    top_3_names = [f"{KRITERIA_CONFIG[c]['nama']}" for c in top_3]
-    weak_1 = winner_scores.nsmallest(1).index.tolist()
-    weak_1_name = KRITERIA_CONFIG[weak_1[0]]['nama'] if weak_1 else "Tidak ada"
-    return top_3_names, weak_1_name
+@st.cache_resource
+def dataset_bersama():
+    # Satu salinan read-only per isi data untuk semua sesi; anggaran memori lewat env SPK_DATASET_BUDGET_MB
+    return DatasetStore()
+
+def hitung_promethee(df, kunci=None):
+    data = st.session_state.data
+    if not data.ada_ubahan():
+        # Tanpa editan sesi: flow dibaca dari evaluator bersama (satu per dataset untuk semua sesi)
+        st.session_state.pop('flow_inkremental', None)
+        data.lepas_state()
+        return evaluator_bobot(df, KRITERIA_CONFIG).hasil()
+    # State flow disimpan per sesi: edit satu baris di editor cukup diperbarui secara inkremental.
+    # State ini (skor + flow keluar/masuk, 3 x n x k float64) tidak bisa dibagi, jadi dipesan dari anggaran DatasetStore
+    flow = st.session_state.get('flow_inkremental')
+    if flow is None:
+        basis = data.frame_basis()
+        if not data.pesan_state(3 * 8 * len(basis) * sum(k in basis.columns for k in KRITERIA_CONFIG)):
+            # Anggaran penuh: tanpa state per sesi, tiap editan dihitung penuh lewat evaluator bersama
+            return evaluator_bobot(df, KRITERIA_CONFIG).hasil()
+        # Editan pertama berangkat dari flow dataset bersama, bukan hitung ulang penuh
+        awal = None
+        if len(basis) >= 2:
+            ev = evaluator_bobot(basis, KRITERIA_CONFIG)
+            awal = (ev.leaving * (len(basis) - 1), ev.entering * (len(basis) - 1))
+        flow = st.session_state.flow_inkremental = FlowInkremental(basis, KRITERIA_CONFIG, data.kunci_basis(), flow=awal)
+    flow.sinkronkan(df, kunci, KRITERIA_CONFIG)
+    # Ukuran state ikut berubah saat baris ditambah/dihapus
+    if not data.pesan_state(flow.nbytes):
+        st.session_state.pop('flow_inkremental', None)
+    return flow.hasil()
+
+@st.cache_resource
+def cache_dashboard():
+    # Satu cache untuk semua sesi: kuncinya hash isi data + KRITERIA_CONFIG, jadi aman dibagi
+    return CacheLRU()
+
+def siapkan_dashboard(df, kunci=None):
+    with profiler.tahap('hash_cache'):
+        kunci_cache = hash_frame(df, KRITERIA_CONFIG)
+        paket = cache_dashboard().get(kunci_cache)
+    if paket is None:
+        with profiler.tahap('hitung_promethee'):
+            hasil = hitung_promethee(df, kunci=kunci)
+        best_mine = hasil.index[0]
+        with profiler.tahap('generate_insight'):
+            insight = generate_insight(df, best_mine)
+        with profiler.tahap('normalisasi_radar'):
+            # Radar hanya butuh baris pemenang, jadi tidak perlu menormalisasi seluruh DataFrame
+            kolom_min = df.min()
+            nilai_radar = ((df.loc[best_mine] - kolom_min) / (df.max() - kolom_min)).tolist()
+        with profiler.tahap('bangun_grafik'):
+            paket = {
+                'kunci': kunci_cache,
+                'hasil': hasil,
+                'insight': insight,
+                'fig_peringkat': buat_grafik_peringkat(hasil, best_mine).to_json(),
+                'fig_radar': buat_grafik_radar(nilai_radar, df.columns.tolist(), best_mine).to_json(),
+            }
+            if mode_besar(len(hasil)):
+                paket['fig_flow'] = buat_grafik_flow(hasil, best_mine).to_json()
+        cache_dashboard().set(kunci_cache, paket)
+    return paket
+
+def tampilkan_tabel_besar(hasil, key, per_halaman=50):
+    # Pencarian + paginasi di server: hanya satu halaman yang di-style dan dikirim ke browser
+    cari = st.text_input("🔍 Cari alternatif", key=f"{key}_cari")
+    tabel = hasil.assign(Peringkat=np.arange(1, len(hasil) + 1))
+    if cari:
+        tabel = tabel[tabel.index.astype(str).str.contains(cari, case=False, regex=False)]
+    jumlah_halaman = max(1, -(-len(tabel) // per_halaman))
+    # Key ikut jumlah halaman agar posisi halaman kembali ke 1 saat hasil pencarian berubah
+    halaman = st.number_input(f"Halaman (dari {jumlah_halaman})", min_value=1, max_value=jumlah_halaman, value=1, key=f"{key}_halaman_{jumlah_halaman}")
+    potongan = tabel.iloc[(halaman - 1) * per_halaman: halaman * per_halaman]
+    # vmin/vmax dari seluruh data agar warna gradien konsisten antar halaman
+    gaya = potongan.style
+    for kolom in hasil.columns:
+        gaya = gaya.background_gradient(cmap="Blues", subset=[kolom], vmin=hasil[kolom].min(), vmax=hasil[kolom].max())
+    st.dataframe(gaya, use_container_width=True)
+    st.caption(f"{len(tabel)} dari {len(hasil)} alternatif")
+
+@st.cache_resource
+def runner_job():
+    # Pool worker bersama semua sesi: job identik (hash data + parameter) hanya dijalankan sekali,
+    # dan semua job berbagi satu process pool (jumlah proses = jumlah CPU)
+    return JobRunner()
+
+def tampilkan_robustness(job, best_mine, index):
+    # Dipanggil sebagai fragment yang polling selama job berjalan, jadi hanya panel ini yang di-rerun
+    if job.aktif():
+        c1, c2 = st.columns([4, 1])
+        with c1:
+            st.progress(job.progres, text=f"Simulasi berjalan... {job.progres:.0%} ({job.durasi():.1f} detik)")
+        with c2:
+            if st.button("⏹️ Batalkan", use_container_width=True):
+                if not runner_job().lepas(job, st.session_state.id_sesi):
+                    st.info("Simulasi tetap berjalan untuk sesi lain yang menunggu hasil yang sama.")
+                st.session_state.pop('job_robustness', None)
+                st.rerun()
+    elif job.status == BATAL:
+        st.warning("Simulasi dibatalkan. Menampilkan hasil parsial terakhir.")
+    elif job.status == GAGAL:
+        st.error(f"Simulasi gagal: {job.error}")
+
+    robust = job.hasil if job.status == SELESAI else job.parsial
+    if robust is not None and list(robust.akseptabilitas.index) == list(index):
+        if job.status != SELESAI:
+            st.caption(f"Hasil parsial dari {robust.n_sampel:,} sampel.")
+        peluang = robust.peluang_juara.sort_values(ascending=False).head(10).reset_index()
+        peluang.columns = ['Alternatif', 'Peluang Juara']
+        fig_robust = px.bar(peluang, y='Alternatif', x='Peluang Juara', orientation='h', text_auto='.1%')
+        fig_robust.update_traces(marker_color=['#0f172a' if x == best_mine else '#94a3b8' for x in peluang['Alternatif']])
+        fig_robust.update_layout(yaxis=dict(autorange='reversed'), height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+        st.plotly_chart(fig_robust, use_container_width=True)
+        st.dataframe(robust.akseptabilitas.join(robust.peringkat_harapan).sort_values('Peringkat Harapan'), use_container_width=True)
+
+@st.cache_resource
+def penyimpanan_skenario():
+    # Lokasi file SQLite bisa diatur lewat env SPK_STORE
+    return SkenarioStore()
+
+def buka_skenario(sk):
+    # Flow tersimpan langsung mengisi evaluator bersama, jadi Dashboard tidak menghitung ulang
+    st.session_state.data = dataset_bersama().daftarkan(sk.df.reset_index())
+    st.session_state.pop('flow_inkremental', None)
+    # Dibandingkan tanpa memperhatikan urutan kriteria; kolom flow tersimpan lalu diurutkan ulang mengikuti KRITERIA_CONFIG
+    if sorted(tanda_tangan_config(sk.config)) == sorted(tanda_tangan_config(KRITERIA_CONFIG)):
+        urutan = [sk.kolom.index(k) for k in KRITERIA_CONFIG if k in sk.kolom]
+        evaluator_bobot(st.session_state.data.frame(), KRITERIA_CONFIG, flow=(sk.leaving[:, urutan], sk.entering[:, urutan]))
+        return True
+    return False
+
+def siapkan_gaia(df, paket, kunci=None):
+    # Matriks flow diambil dari state yang sudah dipakai hitung_promethee (evaluator bersama atau
+    # FlowInkremental sesi), jadi editan baris tidak memicu hitung ulang flow O(n^2 . k)
+    def bangun():
+        hasil = paket['hasil']
+        flow = None
+        if st.session_state.data.ada_ubahan():
+            hitung_promethee(df, kunci=kunci)
+            flow = st.session_state.get('flow_inkremental')
+        if flow is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                proyeksi = proyeksi_gaia((flow.leaving - flow.entering) / (len(flow.label) - 1))
+            index, kolom, bobot = pd.Index(flow.label), flow.kolom, flow.bobot
+        else:
+            evaluator = evaluator_bobot(df, KRITERIA_CONFIG)
+            proyeksi = evaluator.gaia()
+            index, kolom, bobot = evaluator.index, evaluator.kolom, evaluator.bobot
+        nama_kriteria = [KRITERIA_CONFIG[k]['nama'] for k in kolom]
+        fig = buat_grafik_gaia(proyeksi, tongkat_keputusan(proyeksi, bobot), index, nama_kriteria, hasil.index[0])
+        relasi = promethee_i(hasil.index, hasil['Leaving (+)'].to_numpy(), hasil['Entering (-)'].to_numpy())
+        return {'fig_gaia': fig.to_json(), 'delta': proyeksi.delta, 'promethee_i': relasi}
+    return cache_dashboard().get_or_compute((paket['kunci'], 'gaia'), bangun)
 
 # ==========================================
 # 4. SIDEBAR NAVIGATION
@@ -189,8 +280,8 @@ with st.sidebar:
     
     selected_option = option_menu(
         menu_title=None,
-        options=["Dashboard", "Input Data", "Tentang Aplikasi"],
-        icons=["speedometer2", "keyboard", "info-circle"],
+        options=["Dashboard", "Sensitivitas Bobot", "Skenario", "Input Data", "Tentang Aplikasi"],
+        icons=["speedometer2", "sliders", "archive", "keyboard", "info-circle"],
         default_index=0,
         styles={
             "container": {"padding": "0!important", "background-color": "#f0f2f6"},
@@ -207,7 +298,7 @@ with st.sidebar:
     
     uploaded_file = None
     if input_method == "Upload Excel":
-        uploaded_file = st.file_uploader("File .xlsx", type=['xlsx'])
+        uploaded_file = st.file_uploader("File .xlsx / .csv / .parquet", type=list(EKSTENSI))
     
     st.divider()
     st.caption("Developed by **Renaldo Pratama**\nMM Universitas Bakrie")
@@ -217,22 +308,34 @@ with st.sidebar:
 # ==========================================
 
 # --- INISIALISASI DATA ---
-if 'df_input' not in st.session_state:
+# Sesi hanya memegang handle ke dataset bersama + overlay editannya sendiri
+if 'data' not in st.session_state:
     default_cols = ['Nama IUP'] + list(KRITERIA_CONFIG.keys())
-    st.session_state.df_input = pd.DataFrame(columns=default_cols)
+    st.session_state.data = dataset_bersama().daftarkan(pd.DataFrame(columns=default_cols))
+# Identitas sesi sebagai peminat job latar bersama
+if 'id_sesi' not in st.session_state:
+    st.session_state.id_sesi = uuid.uuid4().hex
 
 # Logika Load Data
 if input_method == "Upload Excel" and uploaded_file is not None:
     try:
-        temp_df = pd.read_excel(uploaded_file)
-        st.session_state.df_input = temp_df
-    except:
-        st.error("File tidak valid")
-elif input_method == "Input Manual / Edit" and st.session_state.df_input.empty:
+        with profiler.tahap('ingest'):
+            hasil_ingest = baca_upload(uploaded_file.name, uploaded_file.getvalue(), KRITERIA_CONFIG)
+    except FileTidakValid as e:
+        st.error(f"File tidak valid: {e}")
+    else:
+        # Hanya timpa data saat file berganti, agar editan di Input Data tidak hilang tiap rerun
+        if st.session_state.get('digest_upload') != hasil_ingest.digest:
+            st.session_state.data = dataset_bersama().daftarkan(hasil_ingest.df)
+            st.session_state.digest_upload = hasil_ingest.digest
+        if not hasil_ingest.laporan.empty:
+            with st.sidebar.expander(f"⚠️ {len(hasil_ingest.laporan)} catatan validasi file"):
+                st.dataframe(hasil_ingest.laporan, use_container_width=True, hide_index=True)
+elif input_method == "Input Manual / Edit" and len(st.session_state.data) == 0:
     dummy_data = {'Nama IUP': ['IUP A', 'IUP B', 'IUP C']}
     for k in KRITERIA_CONFIG.keys():
         dummy_data[k] = [0, 0, 0] 
-    st.session_state.df_input = pd.DataFrame(dummy_data)
+    st.session_state.data = dataset_bersama().daftarkan(pd.DataFrame(dummy_data))
 
 
 # --- HALAMAN: TENTANG APLIKASI (UPDATED) ---
@@ -285,13 +388,13 @@ elif selected_option == "Input Data":
     
     with col_input:
         edited_df = st.data_editor(
-            st.session_state.df_input,
+            st.session_state.data.frame_editor(),
             num_rows="dynamic",
             use_container_width=True,
             height=450,
             key="editor"
         )
-        st.session_state.df_input = edited_df
+        st.session_state.data.terapkan(edited_df)
 
     with col_info:
         st.warning("⚠️ **Perhatian**")
@@ -301,15 +404,15 @@ elif selected_option == "Input Data":
         """)
         
         if st.button("💾 Simpan Data", type="primary"):
-            st.session_state.df_input = edited_df
+            st.session_state.data.terapkan(edited_df)
             st.success("Data Tersimpan! Klik Dashboard di menu kiri untuk melihat hasil.")
 
 
 # --- HALAMAN: DASHBOARD ---
 elif selected_option == "Dashboard":
-    df_to_process = st.session_state.df_input.copy()
+    data = st.session_state.data
     
-    if df_to_process.empty or len(df_to_process) < 2:
+    if len(data) < 2:
         st.markdown("<br>", unsafe_allow_html=True)
         c1, c2, c3 = st.columns([1, 2, 1])
         with c2:
@@ -321,17 +424,18 @@ elif selected_option == "Dashboard":
             
     else:
         try:
-            df_to_process = df_to_process.set_index(df_to_process.columns[0])
+            df_to_process = data.frame()
             wajib = list(KRITERIA_CONFIG.keys())
             kurang = [c for c in wajib if c not in df_to_process.columns]
             
             if kurang:
                 st.error(f"❌ Data belum lengkap. Kolom hilang: {kurang}")
             else:
-                hasil = hitung_promethee(df_to_process)
+                paket = siapkan_dashboard(df_to_process, kunci=data.kunci())
+                hasil = paket['hasil']
                 best_mine = hasil.index[0]
                 best_score = hasil.iloc[0]['Net Flow']
-                strengths, weakness = generate_insight(df_to_process, best_mine)
+                strengths, weakness = paket['insight']
                 
                 # Parameter
                 st.subheader("1. Parameter & Konfigurasi Model")
@@ -340,7 +444,8 @@ elif selected_option == "Dashboard":
                     for k, v in KRITERIA_CONFIG.items():
                         param_data.append({
                             "Kode": k, "Nama": v['nama'], "Tipe": v['tipe'].upper(),
-                            "Bobot": f"{v['bobot']:.4f}", "Q": v['q'], "P": v['p']
+                            "Bobot": f"{v['bobot']:.4f}", "Fungsi": v.get('fungsi', 'linear'),
+                            "Q": v.get('q', '-'), "P": v.get('p', '-'), "S": v.get('s', '-')
                         })
                     st.dataframe(pd.DataFrame(param_data), use_container_width=True, hide_index=True)
 
@@ -372,19 +477,15 @@ elif selected_option == "Dashboard":
                 col1, col2 = st.columns([1.5, 1])
                 with col1:
                     st.subheader("📊 Peringkat Performa")
-                    df_chart = hasil.reset_index()
-                    df_chart.columns = ['Alternatif', 'Net Flow', 'Leaving', 'Entering']
-                    df_chart['Warna'] = ['#0f172a' if x == best_mine else '#94a3b8' for x in df_chart['Alternatif']]
-                    fig = px.bar(df_chart, y='Alternatif', x='Net Flow', orientation='h', text_auto='.3f', color='Alternatif', color_discrete_sequence=df_chart['Warna'].tolist())
-                    fig.update_layout(showlegend=False, height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-                    st.plotly_chart(fig, use_container_width=True)
+                    if mode_besar(len(hasil)):
+                        st.caption(f"Menampilkan {TOP_N} teratas dari {len(hasil)} alternatif.")
+                    with profiler.tahap('render_grafik_peringkat'):
+                        st.plotly_chart(pio.from_json(paket['fig_peringkat']), use_container_width=True)
                 
                 with col2:
                     st.subheader("🕸️ Profil Juara")
-                    winner_vals = ((df_to_process - df_to_process.min()) / (df_to_process.max() - df_to_process.min())).loc[best_mine].tolist()
-                    fig_radar = go.Figure(go.Scatterpolar(r=winner_vals, theta=df_to_process.columns.tolist(), fill='toself', name=best_mine))
-                    fig_radar.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1])), showlegend=False, height=400, margin=dict(l=40, r=40, t=20, b=20))
-                    st.plotly_chart(fig_radar, use_container_width=True)
+                    with profiler.tahap('render_grafik_radar'):
+                        st.plotly_chart(pio.from_json(paket['fig_radar']), use_container_width=True)
 
                 # Insight Box
                 st.write("<br>", unsafe_allow_html=True)
@@ -404,8 +505,220 @@ elif selected_option == "Dashboard":
                 """, unsafe_allow_html=True)
 
                 st.divider()
+                if 'fig_flow' in paket:
+                    st.subheader("🔬 Sebaran Leaving vs Entering Flow")
+                    st.plotly_chart(pio.from_json(paket['fig_flow']), use_container_width=True)
+
+                with st.expander("🧭 PROMETHEE I & Bidang GAIA"):
+                    with profiler.tahap('gaia'):
+                        gaia = siapkan_gaia(df_to_process, paket, kunci=data.kunci())
+                    st.markdown(f"**Bidang GAIA** (Δ = {gaia['delta']:.1%} informasi terwakili). Panah merah adalah tongkat keputusan (arah bobot).")
+                    st.plotly_chart(pio.from_json(gaia['fig_gaia']), use_container_width=True)
+
+                    st.markdown("**PROMETHEE I (Partial Ranking)** — relasi tiap alternatif terhadap alternatif lain.")
+                    relasi = gaia['promethee_i'].reindex(hasil.index)
+                    st.dataframe(relasi.head(TOP_N) if mode_besar(len(hasil)) else relasi, use_container_width=True)
+                    tak_terbanding = relasi.loc[best_mine, 'Tak Terbandingkan']
+                    if tak_terbanding:
+                        mask = tak_terbandingkan_dengan(0, hasil['Leaving (+)'].to_numpy(), hasil['Entering (-)'].to_numpy())
+                        daftar = ", ".join(map(str, hasil.index[mask][:20]))
+                        st.info(f"{best_mine} tak terbandingkan dengan {tak_terbanding} alternatif: {daftar}{' ...' if tak_terbanding > 20 else ''}")
+                    else:
+                        st.success(f"{best_mine} tidak memiliki alternatif yang tak terbandingkan.")
+
                 with st.expander("📋 Lihat Tabel Lengkap"):
-                    st.dataframe(hasil.style.background_gradient(cmap="Blues"), use_container_width=True)
+                    if mode_besar(len(hasil)):
+                        tampilkan_tabel_besar(hasil, key="tabel_hasil")
+                    else:
+                        st.dataframe(hasil.style.background_gradient(cmap="Blues"), use_container_width=True)
+
+                with st.expander("🎲 Analisis Robustness (Monte Carlo)"):
+                    st.caption("Skor C1-C14 diganggu ±band poin sesuai tingkat rubrik dan bobot disampling (Dirichlet) di sekitar bobot model.")
+                    # Gangguan skor butuh flow ulang per sampel; di atas batas ini hanya bobot yang diganggu
+                    hanya_bobot = len(df_to_process) > MAKS_N_GANGGUAN_SKOR
+                    if hanya_bobot:
+                        st.info(f"Data berisi lebih dari {MAKS_N_GANGGUAN_SKOR:,} alternatif: simulasi hanya mengganggu bobot dan menampilkan akseptabilitas {MAKS_PERINGKAT} peringkat teratas.")
+                    r1, r2, r3 = st.columns(3)
+                    with r1: n_sampel = st.select_slider("Jumlah Sampel", options=[1_000, 10_000] if hanya_bobot else [1_000, 10_000, 50_000, 100_000], value=10_000)
+                    with r2: band = st.slider("Band Skor (± poin)", 0.0, 20.0, 0.0 if hanya_bobot else 5.0, 0.5, disabled=hanya_bobot)
+                    with r3: konsentrasi = st.slider("Konsentrasi Bobot", 20, 1000, 200, 20, help="Makin besar, makin dekat dengan bobot model.")
+
+                    if st.button("Jalankan Simulasi"):
+                        parameter = dict(n_sampel=n_sampel, band=band, konsentrasi=konsentrasi)
+                        job_lama = st.session_state.get('job_robustness')
+                        try:
+                            # Dijalankan di latar: halaman tetap responsif dan rerun tidak mengulang simulasi
+                            job = runner_job().kirim(
+                                kunci_job('robustness', df_to_process, KRITERIA_CONFIG, **parameter),
+                                robustness_bertahap, df_to_process, KRITERIA_CONFIG, nama='robustness', peminat=st.session_state.id_sesi,
+                                pool=runner_job().pool_proses(), **parameter,
+                            )
+                        except AntrianPenuh as e:
+                            st.warning(str(e))
+                        else:
+                            if job_lama is not None and job_lama is not job:
+                                runner_job().lepas(job_lama, st.session_state.id_sesi)
+                            st.session_state.job_robustness = job
+
+                    job = st.session_state.get('job_robustness')
+                    if job is not None:
+                        polling = job.aktif()
+
+                        @st.fragment(run_every=1.0 if polling else None)
+                        def panel_robustness():
+                            tampilkan_robustness(job, best_mine, df_to_process.index)
+                            if polling and not job.aktif():
+                                # Job baru saja selesai: rerun penuh sekali untuk menghentikan polling
+                                st.rerun()
+                        panel_robustness()
+
+        except Exception as e:
+            st.error(f"Error Proses: {e}")
+
+
+# --- HALAMAN: SENSITIVITAS BOBOT ---
+elif selected_option == "Sensitivitas Bobot":
+    st.title("⚖️ Sensitivitas Bobot")
+    st.markdown("Seberapa jauh bobot tiap kriteria boleh berubah sebelum rekomendasi ikut berubah.")
+    data = st.session_state.data
+
+    if len(data) < 2:
+        st.info("👈 Data masih kosong. Silakan ke menu **Input Data** untuk mengisi nilai.")
+    else:
+        try:
+            df_to_process = data.frame()
+            kurang = [c for c in KRITERIA_CONFIG if c not in df_to_process.columns]
+
+            if kurang:
+                st.error(f"❌ Data belum lengkap. Kolom hilang: {kurang}")
+            else:
+                evaluator = evaluator_bobot(df_to_process, KRITERIA_CONFIG)
+
+                st.subheader("1. Interval Stabilitas Bobot")
+                st.caption("Bobot kriteria lain diskalakan proporsional agar total tetap 1.")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.markdown("**🏆 Juara Tetap**")
+                    st.dataframe(evaluator.interval_stabilitas('juara').round(4), use_container_width=True, hide_index=True)
+                with col2:
+                    st.markdown("**📋 Seluruh Peringkat Tetap**")
+                    st.dataframe(evaluator.interval_stabilitas('penuh').round(4), use_container_width=True, hide_index=True)
+
+                st.divider()
+                st.subheader("2. Simulasi Perubahan Bobot")
+                kriteria = st.selectbox("Kriteria", evaluator.kolom, format_func=lambda k: f"{k} - {KRITERIA_CONFIG[k]['nama']}")
+                t, phi = evaluator.sapuan(kriteria)
+                bobot_sekarang = evaluator.bobot[evaluator.kolom.index(kriteria)] / evaluator.bobot.sum()
+                teratas = np.argsort(-evaluator.evaluasi(evaluator.bobot, dengan_peringkat=False).net_flow[:, 0])[:5]
+
+                fig_sapuan = go.Figure()
+                for i in teratas:
+                    fig_sapuan.add_trace(go.Scatter(x=t, y=phi[i], mode='lines', name=str(evaluator.index[i])))
+                fig_sapuan.add_vline(x=bobot_sekarang, line_dash='dash', line_color='#64748b')
+                fig_sapuan.update_layout(xaxis_title='Bobot', yaxis_title='Net Flow', height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+                st.plotly_chart(fig_sapuan, use_container_width=True)
 
         except Exception as e:
             st.error(f"Error Proses: {e}")
+
+
+# --- HALAMAN: SKENARIO ---
+elif selected_option == "Skenario":
+    st.title("🗂️ Skenario")
+    st.markdown("Simpan data saat ini sebagai skenario, buka kembali kapan saja, dan bandingkan dua skenario.")
+    store = penyimpanan_skenario()
+
+    st.subheader("1. Simpan Skenario Saat Ini")
+    data = st.session_state.data
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        nama_skenario = st.text_input("Nama skenario")
+    with col2:
+        catatan = st.text_input("Catatan (opsional)")
+    if st.button("💾 Simpan Skenario", type="primary"):
+        df_simpan = data.frame()
+        kurang = [c for c in KRITERIA_CONFIG if c not in df_simpan.columns]
+        if len(df_simpan) < 2 or kurang:
+            st.error("Data belum lengkap: minimal 2 alternatif dan seluruh kolom kriteria.")
+        elif not nama_skenario.strip():
+            st.error("Nama skenario tidak boleh kosong.")
+        else:
+            with profiler.tahap('simpan_skenario'):
+                # Flow sesi (inkremental atau evaluator bersama) disimpan apa adanya, tanpa hitung ulang
+                hitung_promethee(df_simpan, kunci=data.kunci())
+                flow = st.session_state.get('flow_inkremental')
+                if flow is not None:
+                    flow_simpan = (flow.leaving, flow.entering)
+                else:
+                    ev = evaluator_bobot(df_simpan, KRITERIA_CONFIG)
+                    flow_simpan = (ev.leaving * (len(df_simpan) - 1), ev.entering * (len(df_simpan) - 1))
+                store.simpan(nama_skenario, df_simpan, KRITERIA_CONFIG, catatan, flow=flow_simpan)
+            st.success(f"Skenario '{nama_skenario.strip()}' tersimpan.")
+
+    st.divider()
+    st.subheader("2. Daftar Skenario")
+    daftar = store.daftar()
+    if daftar.empty:
+        st.info("Belum ada skenario tersimpan.")
+    else:
+        st.dataframe(daftar, use_container_width=True, hide_index=True)
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            dipilih = st.selectbox("Skenario", daftar['Nama'], label_visibility="collapsed")
+        with col2:
+            if st.button("📂 Buka", use_container_width=True):
+                with profiler.tahap('buka_skenario'):
+                    sesuai = buka_skenario(store.muat(dipilih))
+                st.success(f"Skenario '{dipilih}' dimuat. Buka Dashboard untuk melihat hasil.")
+                if not sesuai:
+                    st.warning("Konfigurasi kriteria skenario berbeda dengan konfigurasi aktif; hasil dihitung ulang dengan konfigurasi aktif.")
+        with col3:
+            if st.button("🗑️ Hapus", use_container_width=True):
+                store.hapus(dipilih)
+                st.rerun()
+
+        if len(daftar) >= 2:
+            st.divider()
+            st.subheader("3. Bandingkan Skenario")
+            col1, col2 = st.columns(2)
+            with col1:
+                nama_a = st.selectbox("Skenario A (acuan)", daftar['Nama'], index=1)
+            with col2:
+                nama_b = st.selectbox("Skenario B", daftar['Nama'], index=0)
+
+            with profiler.tahap('diff_skenario'):
+                diff = diff_skenario(store.muat(nama_a), store.muat(nama_b))
+            tabel = diff.tabel
+            bergeser = tabel[tabel['Pergeseran'] != 0]
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Alternatif Bergeser", len(bergeser))
+            c2.metric("Naik", int((tabel['Pergeseran'] > 0).sum()))
+            c3.metric("Turun", int((tabel['Pergeseran'] < 0).sum()))
+            c4.metric("Juara B", str(tabel['Peringkat B'].idxmin()) if not tabel.empty else "-")
+
+            if diff.alternatif_baru or diff.alternatif_hilang:
+                st.caption(f"Alternatif baru di B: {len(diff.alternatif_baru)} | Hilang dari A: {len(diff.alternatif_hilang)}")
+            st.markdown("**Pergeseran Peringkat** — selisih net flow diurai menjadi efek perubahan skor dan efek perubahan bobot.")
+            tampil = bergeser.head(TOP_N * 4) if mode_besar(len(bergeser)) else bergeser
+            st.dataframe(tampil.round(4), use_container_width=True)
+
+            perubahan_bobot = diff.bobot[diff.bobot['Selisih'].abs() > 1e-12]
+            if not perubahan_bobot.empty:
+                st.markdown("**Perubahan Bobot**")
+                st.dataframe(perubahan_bobot.round(4), use_container_width=True, hide_index=True)
+
+
+# --- PANEL PROFILER ---
+if profiler.aktif:
+    profiler.label = selected_option
+    with st.expander(f"🛠️ Profiler ({profiler.total_wall() * 1000:.1f} ms terukur)", expanded=False):
+        if profiler.catatan:
+            df_profil = pd.DataFrame(profiler.catatan)
+            df_profil['wall_ms'] = df_profil.pop('wall_s') * 1000
+            df_profil['cpu_ms'] = df_profil.pop('cpu_s') * 1000
+            df_profil['puncak_kb'] = pd.to_numeric(df_profil.pop('puncak_bytes')) / 1024
+            st.dataframe(df_profil.round(2), use_container_width=True, hide_index=True)
+        else:
+            st.caption("Tidak ada tahap terukur pada rerun ini (kemungkinan seluruhnya dari cache).")
+        st.json({'cache_dashboard': cache_dashboard().statistik(), 'dataset_bersama': dataset_bersama().statistik(), 'job': runner_job().statistik()})
+    profiler.simpan()
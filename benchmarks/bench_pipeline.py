@@ -0,0 +1,188 @@
+"""Benchmark pipeline ranking: waktu dan memori puncak per tahap untuk sapuan n x k.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_pipeline --cepat
+    python -m benchmarks.bench_pipeline --out benchmarks/hasil.json --baseline benchmarks/baseline.json
+
+Hasil ditulis sebagai JSON. Dengan --baseline, tahap yang lebih lambat dari baseline x --ambang
+ditandai dan proses keluar dengan kode 1. Setiap kombinasi n x k juga memeriksa bahwa semua
+varian engine menghasilkan peringkat yang identik.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from promethee.engine import AMBANG_N_BESAR, hitung_promethee
+from promethee.incremental import FlowInkremental
+from promethee.insight import generate_insight
+from promethee.sensitivitas import evaluator_bobot
+from promethee.sintetis import buat_dataset
+
+N_DEFAULT = (10, 100, 1000, 5000, 20000, 50000)
+K_DEFAULT = (14, 50, 200)
+N_CEPAT = (10, 100, 1000)
+K_CEPAT = (14, 50)
+
+# Batas n per tahap agar sapuan penuh tetap selesai dalam waktu wajar
+MAKS_N_PAIRWISE = 5000
+MAKS_N_GRAFIK = 2000
+JUMLAH_SKENARIO_BOBOT = 1000
+
+
+def ukur(fungsi, ulang=3):
+    """Waktu terbaik dari beberapa ulangan dan memori puncak (tracemalloc) satu eksekusi."""
+    tracemalloc.start()
+    hasil = fungsi()
+    _, puncak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    terbaik = float('inf')
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return hasil, terbaik, puncak
+
+
+def tahap_untuk(df, config, n):
+    """Daftar (nama_tahap, fungsi) yang relevan untuk ukuran n."""
+    tahap = []
+    if n <= MAKS_N_PAIRWISE:
+        tahap.append(('engine_pairwise', lambda: hitung_promethee(df, config, metode='pairwise')))
+    tahap.append(('engine_terurut', lambda: hitung_promethee(df, config, metode='terurut')))
+
+    inkremental = FlowInkremental(df, config)
+    baris_edit = df.iloc[[n // 2]].copy()
+
+    def edit_satu_baris():
+        # Bolak-balik satu sel agar state kembali seperti semula setelah tiap ulangan
+        for delta in (1, -1):
+            baris_edit.iloc[0, 0] += delta
+            df_edit = df.copy()
+            df_edit.iloc[n // 2] = baris_edit.iloc[0]
+            inkremental.sinkronkan(df_edit)
+        return inkremental.hasil()
+    tahap.append(('inkremental_edit_baris', edit_satu_baris))
+
+    W = np.random.default_rng(0).random((JUMLAH_SKENARIO_BOBOT, df.shape[1]))
+    tahap.append(('evaluasi_bobot', lambda: evaluator_bobot(df, config).evaluasi(W, dengan_peringkat=False)))
+
+    juara = df.index[0]
+    tahap.append(('generate_insight', lambda: generate_insight(df, juara, config)))
+    tahap.append(('normalisasi_radar', lambda: ((df - df.min()) / (df.max() - df.min())).loc[juara].tolist()))
+
+    if n <= MAKS_N_GRAFIK:
+        try:
+            from promethee.grafik import buat_grafik_peringkat, buat_grafik_radar
+        except ImportError:
+            return tahap
+        hasil = hitung_promethee(df, config)
+        nilai_radar = ((df - df.min()) / (df.max() - df.min())).loc[juara].tolist()
+        tahap.append(('grafik_peringkat', lambda: buat_grafik_peringkat(hasil, juara).to_json()))
+        tahap.append(('grafik_radar', lambda: buat_grafik_radar(nilai_radar, df.columns.tolist(), juara).to_json()))
+    return tahap
+
+
+def periksa_konsistensi(df, config, n, toleransi=1e-9):
+    """Semua varian engine harus memberi net flow sama (hingga toleransi) dan peringkat identik."""
+    acuan = hitung_promethee(df, config, metode='terurut')['Net Flow']
+    # Inkremental: state dibangun tanpa baris terakhir, lalu baris itu ditambahkan lewat delta
+    inkremental = FlowInkremental(df.iloc[:-1], config)
+    inkremental.sinkronkan(df)
+    varian = {'inkremental': inkremental.hasil()['Net Flow']}
+    if n <= MAKS_N_PAIRWISE:
+        varian['pairwise'] = hitung_promethee(df, config, metode='pairwise')['Net Flow']
+    evaluator = evaluator_bobot(df, config)
+    phi = evaluator.evaluasi(evaluator.bobot, dengan_peringkat=False).net_flow[:, 0]
+    varian['evaluator_bobot'] = pd.Series(phi, index=evaluator.index)
+
+    selisih = {}
+    konsisten = True
+    for nama, phi_varian in varian.items():
+        # Urutkan menurut peringkat acuan: net flow varian harus tidak naik (seri dalam toleransi boleh)
+        phi_varian = phi_varian.reindex(acuan.index).to_numpy()
+        selisih[nama] = float(np.abs(phi_varian - acuan.to_numpy()).max())
+        konsisten &= selisih[nama] < toleransi and bool((np.diff(phi_varian) <= toleransi).all())
+    return konsisten, selisih
+
+
+def jalankan(daftar_n, daftar_k, ulang, seed):
+    hasil = []
+    semua_konsisten = True
+    for k in daftar_k:
+        for n in daftar_n:
+            df, config = buat_dataset(n, k, seed)
+            df = df.set_index('Nama IUP')
+            konsisten, selisih = periksa_konsistensi(df, config, n)
+            semua_konsisten &= konsisten
+            print(f"n={n:>6} k={k:>3} konsisten={konsisten} selisih_maks={max(selisih.values()):.2e}")
+            for nama, fungsi in tahap_untuk(df, config, n):
+                _, detik, puncak = ukur(fungsi, ulang)
+                hasil.append({'tahap': nama, 'n': n, 'k': k, 'detik': detik, 'puncak_bytes': puncak})
+                print(f"    {nama:<24} {detik * 1000:>10.2f} ms {puncak / 1e6:>10.2f} MB")
+    return hasil, semua_konsisten
+
+
+def bandingkan(hasil, baseline, ambang):
+    """Daftar tahap yang lebih lambat dari baseline x ambang."""
+    acuan = {(b['tahap'], b['n'], b['k']): b['detik'] for b in baseline['hasil']}
+    lambat = []
+    for h in hasil:
+        lama = acuan.get((h['tahap'], h['n'], h['k']))
+        if lama and h['detik'] > lama * ambang:
+            lambat.append({**h, 'baseline_detik': lama, 'rasio': h['detik'] / lama})
+    return lambat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline ranking PROMETHEE")
+    parser.add_argument('--n', type=int, nargs='+', help=f"Jumlah alternatif (default: {N_DEFAULT})")
+    parser.add_argument('--k', type=int, nargs='+', help=f"Jumlah kriteria (default: {K_DEFAULT})")
+    parser.add_argument('--cepat', action='store_true', help=f"Sapuan kecil: n={N_CEPAT}, k={K_CEPAT}")
+    parser.add_argument('--ulang', type=int, default=3, help="Jumlah ulangan per tahap (diambil yang tercepat)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='benchmarks/hasil.json', help="File JSON hasil")
+    parser.add_argument('--baseline', help="File JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument('--ambang', type=float, default=1.25, help="Rasio waktu terhadap baseline yang dianggap regresi")
+    args = parser.parse_args(argv)
+
+    daftar_n = args.n or (N_CEPAT if args.cepat else N_DEFAULT)
+    daftar_k = args.k or (K_CEPAT if args.cepat else K_DEFAULT)
+    hasil, konsisten = jalankan(daftar_n, daftar_k, args.ulang, args.seed)
+
+    laporan = {
+        'meta': {
+            'waktu': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+            'numpy': np.__version__, 'platform': platform.platform(), 'seed': args.seed,
+            'ambang_n_besar': AMBANG_N_BESAR,
+        },
+        'konsisten': konsisten,
+        'hasil': hasil,
+    }
+    kode_keluar = 0 if konsisten else 1
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            lambat = bandingkan(hasil, json.load(f), args.ambang)
+        laporan['regresi'] = lambat
+        for r in lambat:
+            print(f"REGRESI {r['tahap']} n={r['n']} k={r['k']}: {r['detik']:.4f}s vs {r['baseline_detik']:.4f}s (x{r['rasio']:.2f})")
+        if lambat:
+            kode_keluar = 1
+
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(laporan, f, indent=2)
+    if not konsisten:
+        print("PERINGATAN: varian engine memberi hasil berbeda", file=sys.stderr)
+    return kode_keluar
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Benchmark dan verifikasi kernel fungsi preferensi terhadap implementasi skalar acuan.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_preferensi
+    python -m benchmarks.bench_preferensi --elemen 1000000 --n 300 --out benchmarks/hasil_preferensi.json
+
+Untuk setiap fungsi di REGISTRI: kernel tervektorisasi dibandingkan dengan fungsi skalar per elemen
+(termasuk titik batas d = 0, q, p), lalu flow pairwise, flow terurut, dan pembaruan inkremental
+dibandingkan dengan loop skalar per pasangan. Proses keluar dengan kode 1 jika ada selisih.
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from promethee.engine import flow_kriteria, hitung_promethee, siapkan_matriks
+from promethee.incremental import FlowInkremental
+from promethee.preferensi import REGISTRI, preferensi
+from promethee.sintetis import buat_dataset
+
+# Parameter uji per fungsi (q, p, s); nilai bulat agar banyak selisih skor jatuh tepat di batas
+PARAMETER_UJI = {
+    'usual': (0.0, 0.0, 0.0),
+    'u-shape': (5.0, 0.0, 0.0),
+    'v-shape': (0.0, 20.0, 0.0),
+    'level': (5.0, 15.0, 0.0),
+    'linear': (5.0, 20.0, 0.0),
+    'gaussian': (0.0, 0.0, 10.0),
+}
+TOLERANSI = 1e-9
+
+
+def acuan_skalar(fungsi, d, q, p, s):
+    """Definisi buku teks satu nilai selisih d, sengaja ditulis dengan if/else biasa."""
+    if fungsi == 'usual':
+        return 1.0 if d > 0 else 0.0
+    if fungsi == 'u-shape':
+        return 1.0 if d > q else 0.0
+    if fungsi == 'v-shape':
+        if d <= 0:
+            return 0.0
+        return 1.0 if d > p else d / p
+    if fungsi == 'level':
+        if d <= q:
+            return 0.0
+        return 0.5 if d <= p else 1.0
+    if fungsi == 'linear':
+        if d <= q:
+            return 0.0
+        return 1.0 if d > p else (d - q) / (p - q)
+    if fungsi == 'gaussian':
+        return 1.0 - math.exp(-d * d / (2 * s * s)) if d > 0 else 0.0
+    raise ValueError(f"Tidak ada acuan skalar untuk fungsi {fungsi}")
+
+
+def flow_skalar(x, fungsi, q, p, s):
+    n = len(x)
+    leaving = [0.0] * n
+    entering = [0.0] * n
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                nilai = acuan_skalar(fungsi, x[i] - x[j], q, p, s)
+                leaving[i] += nilai
+                entering[j] += nilai
+    return np.array(leaving), np.array(entering)
+
+
+def config_campuran(k, seed):
+    """Konfigurasi sintetis dengan keenam fungsi preferensi dipakai bergiliran."""
+    _, config = buat_dataset(2, k, seed)
+    for i, v in enumerate(config.values()):
+        nama = list(PARAMETER_UJI)[i % len(PARAMETER_UJI)]
+        q, p, s = PARAMETER_UJI[nama]
+        v.update(fungsi=nama, q=q, p=p, s=s)
+    return config
+
+
+def ukur(fungsi, ulang):
+    terbaik = float('inf')
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik
+
+
+def jalankan(elemen, n, ulang, seed):
+    rng = np.random.default_rng(seed)
+    hasil = []
+    cocok = True
+    for nama in REGISTRI:
+        if nama not in PARAMETER_UJI:
+            print(f"{nama:<10} dilewati: tidak ada parameter uji / acuan skalar")
+            continue
+        q, p, s = PARAMETER_UJI[nama]
+
+        # Kernel vs acuan skalar, termasuk titik batas
+        d = np.concatenate([[-p, -q, 0.0, q, p, -1e-12, 1e-12], rng.uniform(-40, 40, 20_000), rng.integers(-40, 41, 2_000)])
+        selisih_kernel = float(np.abs(preferensi(d, nama, q, p, s) - [acuan_skalar(nama, v, q, p, s) for v in d]).max())
+
+        # Flow satu kriteria: jalur pairwise dan terurut vs loop skalar per pasangan (skor bulat -> banyak seri)
+        x = rng.integers(0, 100, n).astype(float)
+        l_acuan, e_acuan = flow_skalar(x.tolist(), nama, q, p, s)
+        selisih_flow = {}
+        for metode in ('pairwise', 'terurut'):
+            l, e = flow_kriteria(x, nama, q, p, s, metode)
+            selisih_flow[metode] = float(max(np.abs(l - l_acuan).max(), np.abs(e - e_acuan).max()))
+
+        besar = rng.uniform(-50, 50, elemen)
+        detik_kernel = ukur(lambda: preferensi(besar, nama, q, p, s), ulang)
+        detik_skalar = ukur(lambda: [acuan_skalar(nama, v, q, p, s) for v in besar[:10_000]], 1) * elemen / 10_000
+
+        baris_cocok = selisih_kernel < TOLERANSI and max(selisih_flow.values()) < TOLERANSI * n
+        cocok &= baris_cocok
+        hasil.append({
+            'fungsi': nama, 'selisih_kernel': selisih_kernel, 'selisih_flow': selisih_flow,
+            'detik_kernel': detik_kernel, 'detik_skalar_perkiraan': detik_skalar, 'elemen': elemen, 'cocok': baris_cocok,
+        })
+        print(f"{nama:<10} kernel {detik_kernel * 1000:>8.2f} ms  skalar ~{detik_skalar * 1000:>9.0f} ms  "
+              f"selisih kernel={selisih_kernel:.1e} pairwise={selisih_flow['pairwise']:.1e} terurut={selisih_flow['terurut']:.1e}")
+
+    # Dataset dengan keenam fungsi sekaligus: engine (kedua jalur) dan pembaruan inkremental harus sama
+    df, _ = buat_dataset(n, 14, seed)
+    df = df.set_index('Nama IUP')
+    config = config_campuran(14, seed)
+    mk = siapkan_matriks(df, config)
+    phi_acuan = np.zeros(n)
+    for j in range(len(mk.kolom)):
+        l, e = flow_skalar(mk.nilai[:, j].tolist(), mk.fungsi[j], mk.q[j], mk.p[j], mk.s[j])
+        phi_acuan += (l - e) * mk.bobot[j] / (n - 1)
+    selisih_engine = {}
+    for metode in ('pairwise', 'terurut'):
+        phi = hitung_promethee(df, config, metode=metode)['Net Flow'].reindex(df.index).to_numpy()
+        selisih_engine[metode] = float(np.abs(phi - phi_acuan).max())
+    inkremental = FlowInkremental(df, config)
+    df_edit = df.copy()
+    df_edit.iloc[n // 2] = df_edit.iloc[n // 2] + 7
+    inkremental.sinkronkan(df_edit)
+    selisih_engine['inkremental'] = float(np.abs(
+        inkremental.hasil()['Net Flow'].to_numpy() - hitung_promethee(df_edit, config, metode='pairwise')['Net Flow'].to_numpy()
+    ).max())
+    cocok &= max(selisih_engine.values()) < TOLERANSI
+    print("campuran   " + "  ".join(f"{m}={v:.1e}" for m, v in selisih_engine.items()))
+    return hasil, selisih_engine, cocok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark kernel fungsi preferensi PROMETHEE")
+    parser.add_argument('--elemen', type=int, default=1_000_000, help="Jumlah selisih d per pengukuran kernel")
+    parser.add_argument('--n', type=int, default=200, help="Jumlah alternatif untuk uji flow vs loop skalar")
+    parser.add_argument('--ulang', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="File JSON hasil (opsional)")
+    args = parser.parse_args(argv)
+
+    hasil, selisih_engine, cocok = jalankan(args.elemen, args.n, args.ulang, args.seed)
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump({'kernel': hasil, 'campuran': selisih_engine, 'cocok': cocok}, f, indent=2)
+    if not cocok:
+        print("PERINGATAN: kernel tidak cocok dengan acuan skalar", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Inti SPK PROMETHEE yang bisa di-import tanpa Streamlit.
+
+Submodul dimuat saat atributnya pertama kali diakses, jadi `import promethee` tidak ikut memuat
+NumPy/pandas sampai benar-benar dibutuhkan (penting untuk waktu startup CLI)."""
+import importlib
+
+_LOKASI = {
+    'KRITERIA_CONFIG': 'config',
+    'RUBRIK_PENILAIAN': 'config',
+    'hitung_promethee': 'engine',
+    'generate_insight': 'insight',
+    'FlowInkremental': 'incremental',
+    'evaluator_bobot': 'sensitivitas',
+    'analisis_robustness': 'robustness',
+    'baca_upload': 'ingest',
+    'baca_file': 'ingest',
+    'FileTidakValid': 'ingest',
+    'promethee_i': 'gaia',
+    'proyeksi_gaia': 'gaia',
+    'SkenarioStore': 'store',
+    'diff_skenario': 'store',
+    'DatasetStore': 'shared',
+    'JobRunner': 'jobs',
+    'daftarkan_fungsi': 'preferensi',
+}
+
+__all__ = list(_LOKASI)
+
+
+def __getattr__(nama):
+    if nama not in _LOKASI:
+        raise AttributeError(f"module 'promethee' has no attribute {nama!r}")
+    nilai = getattr(importlib.import_module(f'.{_LOKASI[nama]}', __name__), nama)
+    globals()[nama] = nilai
+    return nilai
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,100 @@
+"""Cache LRU berbasis hash isi data untuk jalur rerun Dashboard."""
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+MAKS_ENTRI = 32
+MAKS_BYTES = 64 * 1024 * 1024
+
+
+def hash_frame(df, kriteria_config=None):
+    """Hash stabil dari isi DataFrame (nilai, index, nama kolom) dan konfigurasi kriteria."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([str(c) for c in df.columns]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    if kriteria_config is not None:
+        h.update(json.dumps(kriteria_config, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def ukuran_objek(obj):
+    """Perkiraan ukuran memori (byte) untuk batas kapasitas cache."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(ukuran_objek(k) + ukuran_objek(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(ukuran_objek(v) for v in obj)
+    # Objek lain yang memegang array besar melaporkan ukurannya sendiri lewat atribut nbytes
+    nbytes = getattr(obj, 'nbytes', None)
+    if nbytes is not None:
+        return int(nbytes)
+    return sys.getsizeof(obj)
+
+
+class CacheLRU:
+    """Cache LRU thread-safe dengan batas jumlah entri dan total ukuran, plus statistik hit/miss."""
+
+    def __init__(self, maks_entri=MAKS_ENTRI, maks_bytes=MAKS_BYTES):
+        self.maks_entri = maks_entri
+        self.maks_bytes = maks_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hit = 0
+        self.miss = 0
+        self.eviksi = 0
+
+    def get(self, kunci, default=None):
+        with self._lock:
+            if kunci in self._data:
+                self._data.move_to_end(kunci)
+                self.hit += 1
+                return self._data[kunci][0]
+            self.miss += 1
+            return default
+
+    def set(self, kunci, nilai):
+        ukuran = ukuran_objek(nilai)
+        with self._lock:
+            if kunci in self._data:
+                self.total_bytes -= self._data.pop(kunci)[1]
+            if ukuran > self.maks_bytes:
+                return  # lebih besar dari seluruh kapasitas: tidak disimpan
+            self._data[kunci] = (nilai, ukuran)
+            self.total_bytes += ukuran
+            while len(self._data) > self.maks_entri or self.total_bytes > self.maks_bytes:
+                _, (_, ukuran_lama) = self._data.popitem(last=False)
+                self.total_bytes -= ukuran_lama
+                self.eviksi += 1
+
+    def get_or_compute(self, kunci, fungsi):
+        nilai = self.get(kunci)
+        if nilai is None:
+            nilai = fungsi()
+            self.set(kunci, nilai)
+        return nilai
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def statistik(self):
+        total = self.hit + self.miss
+        return {
+            'entri': len(self._data), 'bytes': self.total_bytes, 'hit': self.hit, 'miss': self.miss,
+            'eviksi': self.eviksi, 'hit_ratio': self.hit / total if total else 0.0,
+        }
@@ -0,0 +1,156 @@
+"""CLI batch ranking tanpa Streamlit.
+
+Contoh:
+    python -m promethee rank data/portofolio/ --out hasil/ --format csv json --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+EKSTENSI_INPUT = ('.xlsx', '.csv', '.parquet')
+FORMAT_OUTPUT = ('csv', 'json')
+
+
+def kumpulkan_file(sumber):
+    """Daftar file portofolio dari kombinasi path file dan direktori (tidak rekursif)."""
+    hasil = []
+    for s in map(Path, sumber):
+        if s.is_dir():
+            hasil.extend(sorted(p for p in s.iterdir() if p.suffix.lower() in EKSTENSI_INPUT and not p.name.startswith('~$')))
+        elif s.is_file():
+            hasil.append(s)
+        else:
+            raise FileNotFoundError(f"Path tidak ditemukan: {s}")
+    return hasil
+
+
+def nama_output(files):
+    """Nama dasar file output per input, unik dalam satu batch.
+
+    Nama file tanpa ekstensi dipakai jika unik; bentrok (a.xlsx dan a.csv, atau nama sama dari direktori
+    berbeda) dibedakan dengan ekstensi, lalu direktori induk, lalu nomor urut."""
+    def bentrok(nama):
+        # Tanpa beda huruf besar/kecil: sistem berkas Windows/macOS tidak membedakannya
+        kecil = [n.lower() for n in nama]
+        return {n for n in nama if kecil.count(n.lower()) > 1}
+
+    nama = [f.stem for f in files]
+    for ubah in (lambda f: f'{f.stem}_{f.suffix.lstrip(".").lower()}',
+                 lambda f: f'{f.resolve().parent.name}_{f.stem}_{f.suffix.lstrip(".").lower()}'):
+        ganda = bentrok(nama)
+        nama = [ubah(f) if n in ganda else n for f, n in zip(files, nama)]
+    ganda = bentrok(nama)
+    terpakai = {n.lower() for n in nama}
+    for i, n in enumerate(nama):
+        if n in ganda:
+            nomor = 2
+            while f'{n}_{nomor}'.lower() in terpakai:
+                nomor += 1
+            nama[i] = f'{n}_{nomor}'
+            terpakai.add(nama[i].lower())
+    return nama
+
+
+def rank_file(path, out_dir, formats, metode='auto', nama=None):
+    """Ranking satu file portofolio dan tulis hasilnya ke <nama>_ranking.*. Dijalankan di proses worker."""
+    # Import berat di sini agar proses utama tetap ringan
+    import pandas as pd
+
+    from .config import KRITERIA_CONFIG
+    from .engine import hitung_promethee
+    from .ingest import KOLOM_NAMA, FileTidakValid, baca_file
+
+    mulai = time.perf_counter()
+    nama = nama or Path(path).stem
+    ringkasan = {'file': str(path), 'output': nama, 'status': 'ok'}
+    try:
+        ingest = baca_file(path, KRITERIA_CONFIG)
+        # Ranking dari array float64 hasil validasi, bukan kolom df yang mungkin dipadatkan
+        df = pd.DataFrame(ingest.nilai, index=pd.Index(ingest.df[KOLOM_NAMA], name=KOLOM_NAMA), columns=list(KRITERIA_CONFIG))
+        if len(df) < 2:
+            raise FileTidakValid("Minimal 2 alternatif")
+        hasil = hitung_promethee(df, KRITERIA_CONFIG, metode=metode)
+
+        hasil.insert(0, 'Peringkat', range(1, len(hasil) + 1))
+        if 'csv' in formats:
+            hasil.to_csv(out_dir / f'{nama}_ranking.csv', index_label=KOLOM_NAMA)
+        if 'json' in formats:
+            hasil.reset_index(names=KOLOM_NAMA).to_json(out_dir / f'{nama}_ranking.json', orient='records', indent=2, force_ascii=False)
+    except (FileTidakValid, OSError) as e:
+        ringkasan.update(status='gagal', pesan=str(e))
+        return ringkasan
+    except Exception as e:
+        # Satu file rusak tidak boleh menggagalkan batch: catat dan lanjut ke file berikutnya
+        ringkasan.update(status='gagal', pesan=f'{type(e).__name__}: {e}')
+        return ringkasan
+
+    ringkasan.update(
+        alternatif=len(hasil),
+        juara=str(hasil.index[0]),
+        net_flow_juara=float(hasil['Net Flow'].iloc[0]),
+        gap=float(hasil['Net Flow'].iloc[0] - hasil['Net Flow'].iloc[1]),
+        catatan_validasi=len(ingest.laporan),
+        detik=round(time.perf_counter() - mulai, 4),
+    )
+    return ringkasan
+
+
+def _rank_args(args):
+    return rank_file(*args)
+
+
+def _hasil_tugas(tugas, future):
+    """Ringkasan dari future worker; kegagalan di luar rank_file (mis. worker mati) dicatat sebagai gagal."""
+    try:
+        return future.result()
+    except Exception as e:
+        return {'file': str(tugas[0]), 'output': tugas[4], 'status': 'gagal', 'pesan': f'{type(e).__name__}: {e}'}
+
+
+def jalankan_rank(args):
+    files = kumpulkan_file(args.input)
+    if not files:
+        print("Tidak ada file .xlsx/.csv/.parquet yang ditemukan.", file=sys.stderr)
+        return 1
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    tugas = [(f, out_dir, tuple(args.format), args.metode, n) for f, n in zip(files, nama_output(files))]
+    workers = min(args.workers or os.cpu_count() or 1, len(files))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_rank_args, t) for t in tugas]
+            ringkasan = [_hasil_tugas(t, f) for t, f in zip(tugas, futures)]
+    else:
+        ringkasan = [rank_file(*t) for t in tugas]
+
+    with open(out_dir / 'ringkasan.json', 'w', encoding='utf-8') as f:
+        json.dump(ringkasan, f, indent=2, ensure_ascii=False)
+    gagal = [r for r in ringkasan if r['status'] != 'ok']
+    for r in gagal:
+        print(f"GAGAL {r['file']}: {r['pesan']}", file=sys.stderr)
+    print(f"{len(ringkasan) - len(gagal)}/{len(ringkasan)} file berhasil diranking -> {out_dir}")
+    return 1 if gagal else 0
+
+
+def buat_parser():
+    parser = argparse.ArgumentParser(prog='python -m promethee', description="SPK Tambang - PROMETHEE II tanpa UI")
+    sub = parser.add_subparsers(dest='perintah', required=True)
+
+    rank = sub.add_parser('rank', help="Ranking portofolio IUP dari file/direktori")
+    rank.add_argument('input', nargs='+', help="File atau direktori berisi .xlsx/.csv/.parquet")
+    rank.add_argument('--out', default='hasil_ranking', help="Direktori output (default: hasil_ranking)")
+    rank.add_argument('--format', nargs='+', choices=FORMAT_OUTPUT, default=['csv'], help="Format output")
+    rank.add_argument('--workers', type=int, default=None, help="Jumlah proses worker (default: jumlah CPU)")
+    rank.add_argument('--metode', choices=('auto', 'pairwise', 'terurut'), default='auto', help="Metode perhitungan flow")
+    rank.set_defaults(fungsi=jalankan_rank)
+    return parser
+
+
+def main(argv=None):
+    args = buat_parser().parse_args(argv)
+    return args.fungsi(args)
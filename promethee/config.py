@@ -0,0 +1,38 @@
+"""Konfigurasi kriteria PROMETHEE dan rubrik penilaian skor."""
+
+# 'fungsi': tipe fungsi preferensi (lihat promethee.preferensi.REGISTRI) beserta parameternya:
+# usual (-), u-shape (q), v-shape (p), level (q, p), linear (q, p), gaussian (s).
+# Parameter yang tidak dipakai tipe fungsinya boleh dihilangkan; default 'fungsi' adalah 'linear'.
+KRITERIA_CONFIG = {
+    'C1':  {'nama': 'Skala Prod',     'tipe': 'max', 'fungsi': 'linear', 'bobot': 0.0225, 'q': 5,  'p': 20},
+    'C2':  {'nama': 'Kebutuhan Market',      'tipe': 'max', 'fungsi': 'linear', 'bobot': 0.1035, 'q': 5,  'p': 20},
+    'C3':  {'nama': 'Profitabilitas', 'tipe': 'max', 'fungsi': 'linear', 'bobot': 0.1440, 'q': 5,  'p': 20}, 
+    'C4':  {'nama': 'COGS (Biaya)',   'tipe': 'min', 'fungsi': 'linear', 'bobot': 0.1845, 'q': 5,  'p': 20}, 
+    'C5':  {'nama': 'Coal Supply Chain',    'tipe': 'min', 'fungsi': 'linear', 'bobot': 0.0385, 'q': 5,  'p': 20}, 
+    'C6':  {'nama': 'Perizinan',      'tipe': 'max', 'fungsi': 'linear', 'bobot': 0.1155, 'q': 2,  'p': 10},
+    'C7':  {'nama': 'Kondisi Geo',    'tipe': 'max', 'fungsi': 'linear', 'bobot': 0.1960, 'q': 5,  'p': 20},
+    'C8':  {'nama': 'RTRW',           'tipe': 'max', 'fungsi': 'linear', 'bobot': 0.0090, 'q': 2,  'p': 10},
+    'C9':  {'nama': 'Karakteristik Geologi',  'tipe': 'max', 'fungsi': 'linear', 'bobot': 0.0255, 'q': 2,  'p': 10},
+    'C10': {'nama': 'Sosial Masyarakat',     'tipe': 'max', 'fungsi': 'linear', 'bobot': 0.0420, 'q': 2,  'p': 10},
+    'C11': {'nama': 'Permit Lingkungan',    'tipe': 'max', 'fungsi': 'linear', 'bobot': 0.0750, 'q': 2,  'p': 10},
+    'C12': {'nama': 'Sektor Bisnis Lainnya',  'tipe': 'max', 'fungsi': 'linear', 'bobot': 0.0035, 'q': 2,  'p': 10},
+    'C13': {'nama': 'Rencana Perusahaan',      'tipe': 'max', 'fungsi': 'linear', 'bobot': 0.0165, 'q': 2,  'p': 10},
+    'C14': {'nama': 'Relasi',         'tipe': 'max', 'fungsi': 'linear', 'bobot': 0.0300, 'q': 2,  'p': 10},
+}
+
+RUBRIK_PENILAIAN = {
+    'C1': {'Low': 'Kapasitas Kecil (Cadangan Minim)', 'Mid': 'Kapasitas Sedang (5-10 Thn)', 'High': 'Kapasitas Besar (>10 Thn)'},
+    'C2': {'Low': 'Sulit Dijual (Low Rank <3000)', 'Mid': 'Pasar Domestik (Std PLN)', 'High': 'Premium/Ekspor (>4500)'},
+    'C3': {'Low': 'Rugi / Margin Negatif', 'Mid': 'Margin Tipis / Sensitif', 'High': 'Sangat Untung (High NPM)'},
+    'C4': {'Low': 'Biaya MAHAL (Hauling Jauh)', 'Mid': 'Biaya WAJAR (Avg Industry)', 'High': 'Biaya MURAH (Efisien)'},
+    'C5': {'Low': 'Rantai RUMIT (Double Handling)', 'Mid': 'Standar (Hambatan Minor)', 'High': 'SEDERHANA (Pit-to-port lancar)'},
+    'C6': {'Low': 'Belum Ada / Bermasalah', 'Mid': 'Proses Berjalan', 'High': 'Lengkap (CnC)'},
+    'C7': {'Low': 'Kompleks (SR Tinggi >10)', 'Mid': 'Ekonomis (SR 5-8)', 'High': 'Sangat Baik (SR <4)'},
+    'C8': {'Low': 'Hutan Lindung / Konflik', 'Mid': 'Butuh Izin Khusus', 'High': 'Area Putih (APL)'},
+    'C9': {'Low': 'Pencemaran Tinggi', 'Mid': 'Terdampak Sedang', 'High': 'Aman / Jauh Pemukiman'},
+    'C10': {'Low': 'Konflik / Demo Warga', 'Mid': 'Kondusif (Berbayar)', 'High': 'Sangat Mendukung'},
+    'C11': {'Low': 'Amdal Belum Ada', 'Mid': 'Dalam Revisi', 'High': 'Amdal Lengkap'},
+    'C12': {'Low': 'Baru Merintis', 'Mid': 'Pemain Lama', 'High': 'Market Leader'},
+    'C13': {'Low': 'Tidak Jelas / Spekulatif', 'Mid': 'Ada tapi Belum Detail', 'High': 'Matang & Terstruktur'},
+    'C14': {'Low': 'Tidak Dikenal', 'Mid': 'Relasi Biasa', 'High': 'Relasi Kuat / Strategis'}
+}
@@ -0,0 +1,153 @@
+"""Engine perhitungan PROMETHEE II tervektorisasi (tanpa dependensi Streamlit)."""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .config import KRITERIA_CONFIG
+from .preferensi import FUNGSI_DEFAULT, ambil_fungsi, preferensi, preferensi_linear
+
+KOLOM_HASIL = ['Net Flow', 'Leaving (+)', 'Entering (-)']
+
+# Batas jumlah elemen satu tile (baris x n) agar memori tetap terkendali untuk n besar
+ELEMEN_PER_TILE = 2_000_000
+
+# Di atas jumlah alternatif ini metode 'auto' memakai algoritma terurut O(k . n log n)
+AMBANG_N_BESAR = 2000
+METODE = ('auto', 'pairwise', 'terurut')
+
+
+class MatriksKriteria(NamedTuple):
+    index: pd.Index
+    kolom: list
+    nilai: np.ndarray    # n x k, sudah diorientasikan (kriteria 'min' dinegasikan)
+    bobot: np.ndarray    # bobot ternormalisasi terhadap total seluruh KRITERIA_CONFIG
+    q: np.ndarray
+    p: np.ndarray
+    arah: np.ndarray     # +1 untuk 'max', -1 untuk 'min'
+    fungsi: list         # tipe fungsi preferensi per kriteria (lihat preferensi.REGISTRI)
+    s: np.ndarray        # parameter s fungsi Gaussian
+
+
+def siapkan_matriks(df, kriteria_config):
+    """Ubah DataFrame skor menjadi matriks float n x k beserta parameter tiap kriteria."""
+    total_bobot = sum(v['bobot'] for v in kriteria_config.values())
+    kolom = [k for k in kriteria_config if k in df.columns]
+    arah = np.array([1.0 if kriteria_config[k]['tipe'] == 'max' else -1.0 for k in kolom])
+    nilai = np.zeros((len(df), len(kolom)))
+    for j, k in enumerate(kolom):
+        nilai[:, j] = pd.to_numeric(df[k], errors='coerce').fillna(0).to_numpy(dtype=float) * arah[j]
+
+    bobot = np.array([kriteria_config[k]['bobot'] for k in kolom], dtype=float)
+    bobot = bobot / total_bobot if total_bobot > 0 else np.zeros(len(kolom))
+    # Parameter yang tidak dipakai tipe fungsinya boleh dihilangkan dari konfigurasi
+    q = np.array([kriteria_config[k].get('q', 0) for k in kolom], dtype=float)
+    p = np.array([kriteria_config[k].get('p', 0) for k in kolom], dtype=float)
+    s = np.array([kriteria_config[k].get('s', 0) for k in kolom], dtype=float)
+    fungsi = [ambil_fungsi(kriteria_config[k].get('fungsi', FUNGSI_DEFAULT)).nama for k in kolom]
+    return MatriksKriteria(df.index, kolom, nilai, bobot, q, p, arah, fungsi, s)
+
+
+def flow_pairwise(x, q, p, ukuran_tile=None, fungsi=FUNGSI_DEFAULT, s=0.0):
+    """Jumlah preferensi keluar/masuk satu kriteria via broadcasting, diproses per tile baris."""
+    n = len(x)
+    leaving = np.zeros(n)
+    entering = np.zeros(n)
+    if ukuran_tile is None:
+        ukuran_tile = max(1, ELEMEN_PER_TILE // max(n, 1))
+
+    for awal in range(0, n, ukuran_tile):
+        akhir = min(awal + ukuran_tile, n)
+        pref = preferensi(x[awal:akhir, None] - x[None, :], fungsi, q, p, s)
+        baris = np.arange(akhir - awal)
+        pref[baris, awal + baris] = 0.0  # i == j tidak dibandingkan
+        leaving[awal:akhir] = pref.sum(axis=1)
+        entering += pref.sum(axis=0)
+    return leaving, entering
+
+
+def flow_terurut(x, q, p):
+    """Hasil identik dengan flow_pairwise tanpa matriks n x n: nilai diurutkan, lalu
+    tiap alternatif memakai binary search + prefix sum untuk daerah linear (q, p]."""
+    n = len(x)
+    if n == 0:
+        return np.zeros(0), np.zeros(0)
+    p = max(p, q)
+    # Batas daerah dicari pada nilai asli agar selisih tepat di q/p (skor bulat) tidak tergeser pembulatan
+    urut = np.sort(x)
+    pusat = x.mean()
+    prefix = np.concatenate(([0.0], np.cumsum(urut - pusat)))  # digeser ke nol agar prefix sum tetap presisi
+
+    # Leaving: d = x_i - x_j. Preferensi penuh jika x_j < x_i - p, linear jika x_i - p <= x_j < x_i - q
+    penuh = np.searchsorted(urut, x - p, side='left')
+    batas = np.searchsorted(urut, x - q, side='left')
+    leaving = penuh.astype(float)
+
+    # Entering: d = x_j - x_i. Penuh jika x_j > x_i + p, linear jika x_i + q < x_j <= x_i + p
+    bawah = np.searchsorted(urut, x + q, side='right')
+    atas = np.searchsorted(urut, x + p, side='right')
+    entering = (n - atas).astype(float)
+
+    if p > q:
+        x = x - pusat
+        leaving += ((x - q) * (batas - penuh) - (prefix[batas] - prefix[penuh])) / (p - q)
+        entering += ((prefix[atas] - prefix[bawah]) - (x + q) * (atas - bawah)) / (p - q)
+
+    # Pasangan (i, i) ikut terhitung bila q < 0; buang agar sama dengan jalur pairwise
+    diri = preferensi_linear(np.zeros(1), q, p)[0]
+    if diri:
+        leaving -= diri
+        entering -= diri
+    return leaving, entering
+
+
+def pilih_metode(n, metode='auto', ambang_n=None):
+    if metode not in METODE:
+        raise ValueError(f"Metode tidak dikenal: {metode}. Pilihan: {METODE}")
+    if metode == 'auto':
+        ambang_n = AMBANG_N_BESAR if ambang_n is None else ambang_n
+        return 'terurut' if n > ambang_n else 'pairwise'
+    return metode
+
+
+def flow_kriteria(x, fungsi, q, p, s, metode, ukuran_tile=None):
+    """Flow satu kriteria. Fungsi piecewise-linear memakai jalur terurut sebagai jumlah komponen
+    linear(q', p'); fungsi lain (mis. Gaussian) selalu lewat jalur pairwise ber-tile."""
+    komponen = ambil_fungsi(fungsi).komponen
+    if metode != 'terurut' or komponen is None:
+        return flow_pairwise(x, q, p, ukuran_tile, fungsi, s)
+    leaving = np.zeros(len(x))
+    entering = np.zeros(len(x))
+    for koefisien, q_komponen, p_komponen in komponen(q, p, s):
+        l, e = flow_terurut(x, q_komponen, p_komponen)
+        leaving += koefisien * l
+        entering += koefisien * e
+    return leaving, entering
+
+
+def flow_unikriteria(mk, metode='auto', ambang_n=None, ukuran_tile=None):
+    """Matriks n x k jumlah preferensi keluar dan masuk per kriteria (belum dibobot/dinormalisasi)."""
+    n, k = mk.nilai.shape
+    metode = pilih_metode(n, metode, ambang_n)
+    leaving = np.zeros((n, k))
+    entering = np.zeros((n, k))
+    for j in range(k):
+        leaving[:, j], entering[:, j] = flow_kriteria(mk.nilai[:, j], mk.fungsi[j], mk.q[j], mk.p[j], mk.s[j], metode, ukuran_tile)
+    return leaving, entering
+
+
+def susun_hasil(index, phi_plus, phi_minus):
+    hasil = pd.DataFrame({'Net Flow': phi_plus - phi_minus, 'Leaving (+)': phi_plus, 'Entering (-)': phi_minus}, index=index)
+    return hasil.sort_values(by='Net Flow', ascending=False)
+
+
+def hitung_promethee(df, kriteria_config=None, metode='auto', ambang_n=None, ukuran_tile=None):
+    kriteria_config = KRITERIA_CONFIG if kriteria_config is None else kriteria_config
+    mk = siapkan_matriks(df, kriteria_config)
+    n = len(mk.index)
+    leaving, entering = flow_unikriteria(mk, metode, ambang_n, ukuran_tile)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        phi_plus = (leaving @ mk.bobot) / (n - 1)
+        phi_minus = (entering @ mk.bobot) / (n - 1)
+    return susun_hasil(mk.index, phi_plus, phi_minus)
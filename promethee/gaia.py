@@ -0,0 +1,120 @@
+"""PROMETHEE I (partial order) dan bidang GAIA dari matriks flow unikriteria."""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# Di atas ukuran ini (n x k) GAIA memakai randomized SVD, bukan SVD penuh
+AMBANG_SVD_ACAK = 200_000
+DESIMAL_FLOW = 12
+
+
+class ProyeksiGaia(NamedTuple):
+    koordinat: np.ndarray   # n x 2, posisi alternatif di bidang GAIA
+    sumbu: np.ndarray       # k x 2, proyeksi sumbu tiap kriteria
+    delta: float            # proporsi informasi (varians) yang terwakili bidang GAIA
+
+
+def _bulatkan(x):
+    # Flow dibulatkan agar selisih galat floating-point dianggap seri (indiferen)
+    return np.round(np.asarray(x, dtype=float), DESIMAL_FLOW)
+
+
+def _hitung_dominasi(a, b):
+    """Untuk tiap i: #{j : a_j <= a_i dan b_j <= b_i}, termasuk i sendiri.
+
+    Merge-sort tree tervektorisasi, O(n log^2 n): prefix urutan a dipecah menjadi segmen 2^L
+    (seperti Fenwick tree), lalu tiap segmen yang terurut menurut rank b dicari dengan searchsorted."""
+    n = len(a)
+    urut_a = np.argsort(a, kind='stable')
+    prefix = np.searchsorted(a[urut_a], a, side='right')
+    rank_b = np.searchsorted(np.unique(b), b)
+    rank_urut = rank_b[urut_a].astype(np.int64)
+
+    hasil = np.zeros(n, dtype=np.int64)
+    lebar = 1
+    while lebar <= n:
+        pakai = (prefix & lebar) != 0
+        if pakai.any():
+            segmen_data = np.arange(n) // lebar
+            kunci = np.sort(segmen_data * (n + 1) + rank_urut)
+            # Segmen lebar 2^L milik prefix m dimulai di (m >> (L+1)) << (L+1); dinyatakan dalam satuan lebar
+            segmen = (prefix[pakai] // (2 * lebar)) * 2
+            hasil[pakai] += np.searchsorted(kunci, segmen * (n + 1) + rank_b[pakai], side='right') - segmen * lebar
+        lebar *= 2
+    return hasil
+
+
+def promethee_i(index, phi_plus, phi_minus):
+    """Jumlah relasi PROMETHEE I per alternatif: mengungguli (P+), diungguli (P-), indiferen (I),
+    dan tak terbandingkan (R), tanpa membentuk matriks relasi n x n."""
+    a = _bulatkan(phi_plus)
+    b = -_bulatkan(phi_minus)  # entering kecil lebih baik
+    n = len(a)
+    _, kelompok, ukuran = np.unique(np.column_stack([a, b]), axis=0, return_inverse=True, return_counts=True)
+    sama = ukuran[kelompok.ravel()]
+
+    lebih = _hitung_dominasi(a, b) - sama
+    kurang = _hitung_dominasi(-a, -b) - sama
+    indiferen = sama - 1
+    tak = (n - 1) - lebih - kurang - indiferen
+    return pd.DataFrame(
+        np.column_stack([lebih, kurang, indiferen, tak]), index=index,
+        columns=['Mengungguli', 'Diungguli', 'Indiferen', 'Tak Terbandingkan'],
+    )
+
+
+def tak_terbandingkan_dengan(i, phi_plus, phi_minus):
+    """Mask alternatif yang tak terbandingkan (R) dengan alternatif ke-i."""
+    sp = np.sign(_bulatkan(phi_plus[i]) - _bulatkan(phi_plus))
+    sm = np.sign(_bulatkan(phi_minus) - _bulatkan(phi_minus[i]))
+    return (sp * sm) < 0
+
+
+def _svd_acak(A, r, oversample=20, iterasi=3, seed=0):
+    """Randomized SVD (Halko dkk.) untuk r komponen teratas."""
+    rng = np.random.default_rng(seed)
+    l = min(r + oversample, min(A.shape))
+    Q, _ = np.linalg.qr(A @ rng.standard_normal((A.shape[1], l)))
+    for _ in range(iterasi):
+        Q, _ = np.linalg.qr(A.T @ Q)
+        Q, _ = np.linalg.qr(A @ Q)
+    Ub, s, Vt = np.linalg.svd(Q.T @ A, full_matrices=False)
+    return (Q @ Ub)[:, :r], s[:r], Vt[:r]
+
+
+def proyeksi_gaia(flow, metode='auto', seed=0):
+    """PCA matriks net flow unikriteria (n x k) ke dua komponen utama."""
+    if metode not in ('auto', 'penuh', 'acak'):
+        raise ValueError("metode harus 'auto', 'penuh', atau 'acak'")
+    A = flow - flow.mean(axis=0)  # net flow unikriteria sudah berpusat nol; jaga dari galat pembulatan
+    n, k = A.shape
+    r = min(2, n, k)
+    if metode == 'auto':
+        metode = 'acak' if n * k > AMBANG_SVD_ACAK else 'penuh'
+
+    if metode == 'acak':
+        U, s, Vt = _svd_acak(A, r, seed=seed)
+    else:
+        U, s, Vt = np.linalg.svd(A, full_matrices=False)
+        U, s, Vt = U[:, :r], s[:r], Vt[:r]
+
+    # Tanda komponen dibuat deterministik: muatan terbesar tiap komponen bernilai positif
+    tanda = np.sign(Vt[np.arange(r), np.abs(Vt).argmax(axis=1)])
+    tanda[tanda == 0] = 1
+    U, Vt = U * tanda, Vt * tanda[:, None]
+
+    koordinat = np.zeros((n, 2))
+    sumbu = np.zeros((k, 2))
+    koordinat[:, :r] = U * s
+    sumbu[:, :r] = Vt.T
+    total = float((A ** 2).sum())
+    delta = float((s ** 2).sum() / total) if total > 0 else 0.0
+    return ProyeksiGaia(koordinat, sumbu, delta)
+
+
+def tongkat_keputusan(proyeksi, bobot):
+    """Proyeksi vektor bobot ('decision stick') ke bidang GAIA; satu-satunya bagian yang bergantung bobot."""
+    bobot = np.asarray(bobot, dtype=float)
+    total = bobot.sum()
+    return proyeksi.sumbu.T @ (bobot / total if total > 0 else bobot)
@@ -0,0 +1,105 @@
+"""Pembuat figure Plotly untuk Dashboard (dipakai juga oleh benchmark)."""
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Di atas jumlah alternatif ini Dashboard memakai mode data besar: grafik satu trace (top-N),
+# scatter WebGL, dan tabel berhalaman, karena satu trace per alternatif berat untuk dibangun dan dikirim
+AMBANG_MODE_BESAR = 100
+TOP_N = 25
+WARNA_JUARA = '#0f172a'
+WARNA_LAIN = '#94a3b8'
+
+
+def mode_besar(n):
+    return n > AMBANG_MODE_BESAR
+
+
+def buat_grafik_peringkat(hasil, best_mine):
+    if mode_besar(len(hasil)):
+        return buat_grafik_peringkat_top(hasil, best_mine)
+    df_chart = hasil.reset_index()
+    df_chart.columns = ['Alternatif', 'Net Flow', 'Leaving', 'Entering']
+    df_chart['Warna'] = [WARNA_JUARA if x == best_mine else WARNA_LAIN for x in df_chart['Alternatif']]
+    fig = px.bar(df_chart, y='Alternatif', x='Net Flow', orientation='h', text_auto='.3f', color='Alternatif', color_discrete_sequence=df_chart['Warna'].tolist())
+    fig.update_layout(showlegend=False, height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+
+def buat_grafik_radar(winner_vals, theta, best_mine):
+    fig_radar = go.Figure(go.Scatterpolar(r=winner_vals, theta=theta, fill='toself', name=best_mine))
+    fig_radar.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1])), showlegend=False, height=400, margin=dict(l=40, r=40, t=20, b=20))
+    return fig_radar
+
+
+def buat_grafik_peringkat_top(hasil, best_mine, top_n=TOP_N):
+    """Satu trace untuk top-N alternatif; juara dibedakan lewat warna marker."""
+    top = hasil.head(top_n)
+    nama = [str(x) for x in top.index]
+    fig = go.Figure(go.Bar(
+        x=top['Net Flow'], y=nama, orientation='h',
+        marker_color=[WARNA_JUARA if x == best_mine else WARNA_LAIN for x in top.index],
+        text=[f"{v:.3f}" for v in top['Net Flow']], textposition='auto',
+    ))
+    fig.update_layout(
+        showlegend=False, height=max(400, 18 * len(top)), yaxis=dict(autorange='reversed'),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', margin=dict(t=20),
+    )
+    return fig
+
+
+def buat_grafik_flow(hasil, best_mine):
+    """Scatter WebGL Leaving (phi+) vs Entering (phi-) untuk seluruh alternatif."""
+    juara = hasil.index == best_mine
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=hasil['Leaving (+)'][~juara], y=hasil['Entering (-)'][~juara], mode='markers', name='Alternatif',
+        text=[str(x) for x in hasil.index[~juara]], marker=dict(color=WARNA_LAIN, size=5, opacity=0.7),
+        hovertemplate='%{text}<br>φ+ %{x:.3f}<br>φ- %{y:.3f}<extra></extra>',
+    ))
+    fig.add_trace(go.Scattergl(
+        x=hasil['Leaving (+)'][juara], y=hasil['Entering (-)'][juara], mode='markers', name=str(best_mine),
+        text=[str(best_mine)], marker=dict(color=WARNA_JUARA, size=12, symbol='star'),
+        hovertemplate='%{text}<br>φ+ %{x:.3f}<br>φ- %{y:.3f}<extra></extra>',
+    ))
+    fig.update_layout(
+        xaxis_title='Leaving (φ+)', yaxis_title='Entering (φ-)', height=400, showlegend=False,
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', margin=dict(t=20),
+    )
+    return fig
+
+
+def buat_grafik_gaia(proyeksi, tongkat, index, nama_kriteria, best_mine):
+    """Bidang GAIA: titik alternatif, sumbu kriteria, dan tongkat keputusan (decision stick)."""
+    xy = proyeksi.koordinat
+    jari = float(max(abs(xy).max(), 1e-12))
+    besar = mode_besar(len(index))
+    Scatter = go.Scattergl if besar else go.Scatter
+    juara = index == best_mine
+
+    fig = go.Figure()
+    fig.add_trace(Scatter(
+        x=xy[~juara, 0], y=xy[~juara, 1], mode='markers' if besar else 'markers+text',
+        text=[str(x) for x in index[~juara]], textposition='top center', name='Alternatif',
+        marker=dict(color=WARNA_LAIN, size=5 if besar else 9),
+        hovertemplate='%{text}<extra></extra>',
+    ))
+    fig.add_trace(go.Scatter(
+        x=xy[juara, 0], y=xy[juara, 1], mode='markers+text', text=[str(best_mine)], textposition='top center',
+        name=str(best_mine), marker=dict(color=WARNA_JUARA, size=14, symbol='star'), hovertemplate='%{text}<extra></extra>',
+    ))
+
+    # Sumbu kriteria diskalakan ke jari-jari sebaran alternatif agar terbaca di bidang yang sama
+    skala_sumbu = jari / float(max(abs(proyeksi.sumbu).max(), 1e-12))
+    for (x, y), nama in zip(proyeksi.sumbu * skala_sumbu, nama_kriteria):
+        fig.add_trace(go.Scatter(x=[0, x], y=[0, y], mode='lines+text', text=['', nama], textposition='top center',
+                                 line=dict(color='#2563eb', width=1), hoverinfo='skip', showlegend=False))
+    ujung = tongkat * skala_sumbu
+    fig.add_annotation(x=ujung[0], y=ujung[1], ax=0, ay=0, xref='x', yref='y', axref='x', ayref='y',
+                       showarrow=True, arrowhead=3, arrowwidth=3, arrowcolor='#e11d48')
+
+    fig.update_layout(
+        showlegend=False, height=500, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(zeroline=True, title='Komponen 1'), yaxis=dict(zeroline=True, title='Komponen 2', scaleanchor='x'),
+        margin=dict(t=20),
+    )
+    return fig
@@ -0,0 +1,187 @@
+"""Pembaruan flow PROMETHEE II secara inkremental untuk edit baris di editor Input Data."""
+import numpy as np
+import pandas as pd
+
+from .engine import flow_unikriteria, pilih_metode, siapkan_matriks, susun_hasil
+from .preferensi import FUNGSI_DEFAULT, preferensi_kolom
+
+# Setelah sekian operasi delta, state dihitung ulang penuh untuk membuang akumulasi galat floating-point
+MAKS_OPERASI_DELTA = 1000
+
+
+def tanda_tangan_config(kriteria_config):
+    """Bagian konfigurasi yang memengaruhi flow unikriteria (bobot tidak termasuk)."""
+    return [
+        (k, v['tipe'], v.get('fungsi', FUNGSI_DEFAULT), v.get('q', 0), v.get('p', 0), v.get('s', 0))
+        for k, v in kriteria_config.items()
+    ]
+
+
+class FlowInkremental:
+    """Menyimpan matriks skor dan jumlah preferensi keluar/masuk per kriteria (n x k) untuk satu dataset.
+
+    Edit, tambah, dan hapus satu baris hanya mengubah baris dan kolom alternatif tersebut di matriks
+    preferensi, sehingga flow diperbarui dalam O(n . k), bukan dihitung ulang O(n^2 . k)."""
+
+    def __init__(self, df, kriteria_config, kunci=None, flow=None):
+        self.kriteria_config = kriteria_config
+        self.muat_ulang(df, kunci, flow)
+
+    # --- State penuh ---
+    def muat_ulang(self, df, kunci=None, flow=None):
+        """flow: (leaving, entering) yang sudah dihitung untuk df ini, mis. dari penyimpanan skenario."""
+        mk = siapkan_matriks(df, self.kriteria_config)
+        self.kolom = mk.kolom
+        self.label = list(mk.index)
+        self.nama_index = mk.index.name
+        self.kunci = list(df.index if kunci is None else kunci)
+        self.nilai = mk.nilai.copy()
+        self.bobot, self.q, self.p, self.arah = mk.bobot, mk.q, mk.p, mk.arah
+        self.fungsi, self.s = mk.fungsi, mk.s
+        if flow is None:
+            self.leaving, self.entering = flow_unikriteria(mk)
+        else:
+            # Disalin karena state diperbarui in-place oleh operasi delta
+            self.leaving, self.entering = (np.array(f, dtype=float) for f in flow)
+        self.operasi_delta = 0
+
+    def _tanda_tangan_config(self):
+        return tanda_tangan_config(self.kriteria_config)
+
+    # --- Operasi delta per baris ---
+    def _kontribusi(self, v):
+        """Preferensi v atas semua baris (n x k) dan semua baris atas v."""
+        keluar = preferensi_kolom(v[None, :] - self.nilai, self.fungsi, self.q, self.p, self.s)
+        masuk = preferensi_kolom(self.nilai - v[None, :], self.fungsi, self.q, self.p, self.s)
+        return keluar, masuk
+
+    def ubah_baris(self, i, v_baru):
+        keluar_lama, masuk_lama = self._kontribusi(self.nilai[i])
+        keluar_lama[i] = 0.0
+        masuk_lama[i] = 0.0
+        self.nilai[i] = v_baru
+        keluar_baru, masuk_baru = self._kontribusi(v_baru)
+        keluar_baru[i] = 0.0
+        masuk_baru[i] = 0.0
+
+        # Untuk baris j lain: P(j, i) masuk ke leaving j, P(i, j) masuk ke entering j
+        self.leaving += masuk_baru - masuk_lama
+        self.entering += keluar_baru - keluar_lama
+        self.leaving[i] = keluar_baru.sum(axis=0)
+        self.entering[i] = masuk_baru.sum(axis=0)
+        self.operasi_delta += 1
+
+    def tambah_baris(self, kunci, label, v):
+        keluar, masuk = self._kontribusi(v)
+        self.leaving += masuk
+        self.entering += keluar
+        self.leaving = np.vstack([self.leaving, keluar.sum(axis=0)])
+        self.entering = np.vstack([self.entering, masuk.sum(axis=0)])
+        self.nilai = np.vstack([self.nilai, v])
+        self.kunci.append(kunci)
+        self.label.append(label)
+        self.operasi_delta += 1
+
+    def hapus_baris(self, i):
+        keluar, masuk = self._kontribusi(self.nilai[i])
+        self.leaving -= masuk
+        self.entering -= keluar
+        self.leaving = np.delete(self.leaving, i, axis=0)
+        self.entering = np.delete(self.entering, i, axis=0)
+        self.nilai = np.delete(self.nilai, i, axis=0)
+        del self.kunci[i]
+        del self.label[i]
+        self.operasi_delta += 1
+
+    # --- Sinkronisasi dengan DataFrame hasil editor ---
+    def sinkronkan(self, df, kunci=None, kriteria_config=None):
+        """Samakan state dengan df. Mengembalikan 'tetap', 'inkremental', atau 'ulang'."""
+        if kriteria_config is not None and kriteria_config is not self.kriteria_config:
+            ganti_parameter = tanda_tangan_config(kriteria_config) != self._tanda_tangan_config()
+            self.kriteria_config = kriteria_config
+            if ganti_parameter:
+                self.muat_ulang(df, kunci)
+                return 'ulang'
+
+        mk = siapkan_matriks(df, self.kriteria_config)
+        self.bobot = mk.bobot  # bobot hanya dipakai saat membaca hasil
+        kunci_baru = list(df.index if kunci is None else kunci)
+        label_baru = list(mk.index)
+
+        rencana = self._rencana_delta(mk, kunci_baru)
+        if rencana is None:
+            self.muat_ulang(df, kunci)
+            return 'ulang'
+        hapus, ubah, tambah = rencana
+        if not (hapus or ubah or tambah):
+            self.label = label_baru
+            return 'tetap'
+
+        for i in sorted(hapus, reverse=True):
+            self.hapus_baris(i)
+        posisi = {k: i for i, k in enumerate(self.kunci)}
+        for j_baru in ubah:
+            self.ubah_baris(posisi[kunci_baru[j_baru]], mk.nilai[j_baru])
+        for j_baru in tambah:
+            self.tambah_baris(kunci_baru[j_baru], label_baru[j_baru], mk.nilai[j_baru])
+        self.label = label_baru
+
+        if self.operasi_delta > MAKS_OPERASI_DELTA:
+            self.muat_ulang(df, kunci)
+            return 'ulang'
+        return 'inkremental'
+
+    def _rencana_delta(self, mk, kunci_baru):
+        """Daftar (hapus, ubah, tambah) atau None jika lebih murah/aman menghitung ulang penuh."""
+        if mk.kolom != self.kolom:
+            return None
+        if len(set(kunci_baru)) != len(kunci_baru) or len(set(self.kunci)) != len(self.kunci):
+            return None
+
+        set_baru = set(kunci_baru)
+        set_lama = set(self.kunci)
+        hapus = [i for i, k in enumerate(self.kunci) if k not in set_baru]
+        tetap_lama = [k for k in self.kunci if k in set_baru]
+        tetap_baru = [k for k in kunci_baru if k in set_lama]
+        # Baris lama harus tetap berurutan dan baris baru hanya boleh muncul di akhir
+        if tetap_lama != tetap_baru or kunci_baru[:len(tetap_baru)] != tetap_baru:
+            return None
+
+        posisi_lama = {k: i for i, k in enumerate(self.kunci)}
+        n_tetap = len(tetap_baru)
+        lama = self.nilai[[posisi_lama[k] for k in tetap_baru]]
+        ubah = np.flatnonzero((lama != mk.nilai[:n_tetap]).any(axis=1)).tolist()
+        tambah = list(range(n_tetap, len(kunci_baru)))
+
+        n = len(kunci_baru)
+        jumlah_operasi = len(hapus) + len(ubah) + len(tambah)
+        if pilih_metode(n) == 'pairwise':
+            batas = max(1, n // 8)
+        else:
+            batas = max(1, int(np.log2(max(n, 2))))
+        if jumlah_operasi > batas:
+            return None
+        return hapus, ubah, tambah
+
+    @property
+    def nbytes(self):
+        """Memori state per dataset: matriks skor plus jumlah preferensi keluar/masuk (masing-masing n x k)."""
+        return self.nilai.nbytes + self.leaving.nbytes + self.entering.nbytes
+
+    # --- Hasil ---
+    def hasil(self):
+        n = len(self.label)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            phi_plus = (self.leaving @ self.bobot) / (n - 1)
+            phi_minus = (self.entering @ self.bobot) / (n - 1)
+        return susun_hasil(pd.Index(self.label, name=self.nama_index), phi_plus, phi_minus)
+
+    def periksa_konsistensi(self):
+        """Selisih absolut maksimum state inkremental terhadap perhitungan ulang penuh."""
+        leaving, entering = flow_unikriteria(siapkan_matriks(self._sebagai_df(), self.kriteria_config))
+        if not leaving.size:
+            return 0.0
+        return float(max(np.abs(leaving - self.leaving).max(), np.abs(entering - self.entering).max()))
+
+    def _sebagai_df(self):
+        return pd.DataFrame(self.nilai * self.arah, columns=self.kolom)
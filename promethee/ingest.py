@@ -0,0 +1,145 @@
+"""Ingest file upload (Excel/CSV/Parquet): parse sekali per digest, validasi skema, dan koersi numerik."""
+import hashlib
+import io
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import CacheLRU
+
+KOLOM_NAMA = 'Nama IUP'
+EKSTENSI = ('xlsx', 'csv', 'parquet')
+RENTANG_SKOR = (0, 100)
+# Skor disimpan float32 hanya jika semua nilainya terwakili tepat (mis. skor rubrik bulat); selain itu float64
+DTYPE_RINGKAS = np.float32
+
+_cache_ingest = CacheLRU(maks_entri=8, maks_bytes=256 * 1024 * 1024)
+
+
+class FileTidakValid(ValueError):
+    """File tidak bisa dibaca atau kolom wajib tidak lengkap."""
+
+
+class HasilIngest(NamedTuple):
+    df: pd.DataFrame        # Nama IUP + kolom kriteria (float32 jika tanpa kehilangan presisi), untuk editor/Dashboard
+    nilai: np.ndarray       # n x k float64 C-contiguous, urutan kolom mengikuti kriteria_config; dasar ranking
+    laporan: pd.DataFrame   # Baris, Kolom, Nilai, Pesan
+    digest: str
+
+
+def digest_file(isi):
+    return hashlib.sha256(isi).hexdigest()
+
+
+def _baca_xlsx(isi, kolom_wajib):
+    """Baca sheet pertama dengan mode read-only openpyxl (streaming baris, tanpa membangun DataFrame perantara)."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(io.BytesIO(isi), read_only=True, data_only=True)
+    try:
+        baris = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(baris, None)
+        if header is None:
+            raise FileTidakValid("Sheet kosong")
+        header = ['' if h is None else str(h).strip() for h in header]
+        posisi = _posisi_kolom(header, kolom_wajib)
+        kolom = [header[i] for i in posisi]
+        data = [[r[i] if i < len(r) else None for i in posisi] for r in baris if r and any(v is not None for v in r)]
+    finally:
+        wb.close()
+    return pd.DataFrame(data, columns=kolom, dtype=object)
+
+
+def _posisi_kolom(header, kolom_wajib):
+    kurang = [c for c in kolom_wajib if c not in header]
+    if kurang:
+        raise FileTidakValid(f"Kolom hilang: {kurang}")
+    # Kolom nama: 'Nama IUP' jika ada, selain itu kolom pertama (sama seperti Dashboard)
+    nama = header.index(KOLOM_NAMA) if KOLOM_NAMA in header else 0
+    if header[nama] in kolom_wajib:
+        raise FileTidakValid(f"Kolom hilang: ['{KOLOM_NAMA}']")
+    return [nama] + [header.index(c) for c in kolom_wajib]
+
+
+def _baca_tabel(nama_file, isi, kolom_wajib):
+    ekstensi = nama_file.rsplit('.', 1)[-1].lower()
+    if ekstensi not in EKSTENSI:
+        raise FileTidakValid(f"Format .{ekstensi} tidak didukung. Gunakan: {', '.join(EKSTENSI)}")
+    try:
+        if ekstensi == 'xlsx':
+            return _baca_xlsx(isi, kolom_wajib)
+        if ekstensi == 'csv':
+            df = pd.read_csv(io.BytesIO(isi), dtype=object, skip_blank_lines=True)
+        else:
+            df = pd.read_parquet(io.BytesIO(isi))
+    except FileTidakValid:
+        raise
+    except ImportError as e:
+        raise FileTidakValid(f"Dependensi untuk membaca .{ekstensi} belum terpasang: {e}") from e
+    except Exception as e:
+        raise FileTidakValid(f"File .{ekstensi} tidak dapat dibaca: {e}") from e
+
+    df.columns = [str(c).strip() for c in df.columns]
+    return df.iloc[:, _posisi_kolom(list(df.columns), kolom_wajib)]
+
+
+def validasi(df_mentah, kolom_wajib):
+    """Koersi kolom kriteria ke numerik dalam satu lintasan dan kumpulkan laporan error per baris.
+
+    Sel non-numerik/kosong diisi 0 (sama dengan hitung_promethee), skor di luar rentang hanya dilaporkan."""
+    n = len(df_mentah)
+    nama = df_mentah.iloc[:, 0]
+    nilai = np.zeros((n, len(kolom_wajib)))
+    laporan = []
+
+    def catat(mask, kolom, mentah, pesan):
+        for i in np.flatnonzero(mask):
+            laporan.append({'Baris': int(i) + 2, 'Kolom': kolom, 'Nilai': '' if pd.isna(mentah[i]) else str(mentah[i]), 'Pesan': pesan})
+
+    nama_kosong = nama.isna().to_numpy() | (nama.astype(str).str.strip() == '').to_numpy()
+    catat(nama_kosong, df_mentah.columns[0], nama.to_numpy(), "Nama kosong")
+    duplikat = nama.duplicated(keep=False).to_numpy() & ~nama_kosong
+    catat(duplikat, df_mentah.columns[0], nama.to_numpy(), "Nama duplikat")
+
+    for j, k in enumerate(kolom_wajib):
+        mentah = df_mentah[k].to_numpy()
+        angka = pd.to_numeric(df_mentah[k], errors='coerce').to_numpy(dtype=float)
+        kosong = pd.isna(mentah)
+        gagal = np.isnan(angka) & ~kosong
+        catat(kosong, k, mentah, "Kosong, diisi 0")
+        catat(gagal, k, mentah, "Bukan angka, diisi 0")
+        angka = np.where(np.isnan(angka), 0.0, angka)
+        catat((angka < RENTANG_SKOR[0]) | (angka > RENTANG_SKOR[1]), k, mentah, f"Di luar rentang {RENTANG_SKOR[0]}-{RENTANG_SKOR[1]}")
+        nilai[:, j] = angka
+
+    ringkas = nilai.astype(DTYPE_RINGKAS)
+    # Skor desimal yang berubah bila dipadatkan tetap float64, jadi df selalu identik dengan nilai
+    df = pd.DataFrame(ringkas if np.array_equal(ringkas, nilai) else nilai.copy(), columns=kolom_wajib)
+    label = nama.astype(str).str.strip().to_numpy(dtype=object)
+    label[nama_kosong] = [f"Baris {i + 2}" for i in np.flatnonzero(nama_kosong)]
+    df.insert(0, KOLOM_NAMA, label)
+    laporan = pd.DataFrame(laporan, columns=['Baris', 'Kolom', 'Nilai', 'Pesan'])
+    return df, np.ascontiguousarray(nilai), laporan.sort_values(['Baris', 'Kolom'], kind='stable', ignore_index=True)
+
+
+def baca_upload(nama_file, isi, kriteria_config):
+    """Parse + validasi file upload. Hasil di-cache per digest isi file, jadi rerun tidak mem-parse ulang."""
+    digest = digest_file(isi)
+    kunci = (digest, tuple(kriteria_config))
+    hasil = _cache_ingest.get(kunci)
+    if hasil is None:
+        kolom_wajib = list(kriteria_config)
+        df, nilai, laporan = validasi(_baca_tabel(nama_file, isi, kolom_wajib), kolom_wajib)
+        hasil = HasilIngest(df, nilai, laporan, digest)
+        _cache_ingest.set(kunci, hasil)
+    return hasil
+
+
+def baca_file(path, kriteria_config):
+    """Versi tanpa cache untuk pemrosesan batch (CLI): tiap file hanya dibaca sekali."""
+    with open(path, 'rb') as f:
+        isi = f.read()
+    kolom_wajib = list(kriteria_config)
+    df, nilai, laporan = validasi(_baca_tabel(str(path), isi, kolom_wajib), kolom_wajib)
+    return HasilIngest(df, nilai, laporan, digest_file(isi))
@@ -0,0 +1,24 @@
+"""Ringkasan naratif keunggulan dan kelemahan alternatif terbaik."""
+from .config import KRITERIA_CONFIG
+
+
+def generate_insight(df, winner_name, kriteria_config=None):
+    kriteria_config = KRITERIA_CONFIG if kriteria_config is None else kriteria_config
+    # Cukup normalisasi baris pemenang; tidak perlu salinan seluruh DataFrame
+    winner_scores = df.loc[winner_name].copy()
+    kolom_min, kolom_max = df.min(), df.max()
+    for col in df.columns:
+        if col in kriteria_config:
+            rentang = kolom_max[col] - kolom_min[col]
+            if rentang == 0:
+                winner_scores[col] = 0
+            elif kriteria_config[col]['tipe'] == 'max':
+                winner_scores[col] = (winner_scores[col] - kolom_min[col]) / rentang
+            else:
+                winner_scores[col] = (kolom_max[col] - winner_scores[col]) / rentang
+
+    top_3 = winner_scores.nlargest(3).index.tolist()
+    top_3_names = [f"{kriteria_config[c]['nama']}" for c in top_3]
+    weak_1 = winner_scores.nsmallest(1).index.tolist()
+    weak_1_name = kriteria_config[weak_1[0]]['nama'] if weak_1 else "Tidak ada"
+    return top_3_names, weak_1_name
@@ -0,0 +1,177 @@
+"""Eksekusi analisis berat di latar belakang: pool worker terbatas, dedup per hash input, progres, dan pembatalan.
+
+Fungsi job adalah generator yang me-yield (progres 0..1, hasil parsial) setelah tiap langkah. Runner
+menyimpan hasil parsial terakhir sehingga UI bisa menampilkannya selagi job berjalan, dan memeriksa
+permintaan batal di antara langkah. Job dengan kunci sama dibagi oleh semua sesi yang mengirimnya."""
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .cache import hash_frame
+
+ANTRI = 'antri'
+JALAN = 'jalan'
+SELESAI = 'selesai'
+BATAL = 'batal'
+GAGAL = 'gagal'
+
+MAKS_WORKER = min(4, os.cpu_count() or 1)
+# Total proses worker untuk semua job yang membagi kerjanya ke process pool bersama
+MAKS_PROSES = os.cpu_count() or 1
+MAKS_ANTRIAN = 16
+# Job yang sudah berakhir disimpan sebanyak ini agar kiriman ulang yang identik langsung mendapat hasil
+MAKS_JOB_SIMPAN = 32
+
+
+class AntrianPenuh(RuntimeError):
+    """Jumlah job yang menunggu/berjalan sudah mencapai batas antrian."""
+
+
+def kunci_job(jenis, df, kriteria_config, **parameter):
+    """Kunci dedup: jenis analisis + hash isi data dan konfigurasi + parameter."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([jenis, hash_frame(df, kriteria_config), parameter], sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class Job:
+    def __init__(self, kunci, nama):
+        self.kunci = kunci
+        self.nama = nama
+        self.status = ANTRI
+        self.progres = 0.0
+        self.parsial = None
+        self.hasil = None
+        self.error = None
+        self.dikirim = time.time()
+        self.mulai = None
+        self.selesai = None
+        self.peminat = set()      # id sesi yang menunggu job ini
+        self._batal = threading.Event()
+        self._future = None
+
+    def aktif(self):
+        return self.status in (ANTRI, JALAN)
+
+    def durasi(self):
+        if self.mulai is None:
+            return 0.0
+        return (self.selesai or time.time()) - self.mulai
+
+
+class JobRunner:
+    """Pool thread terbatas. Komputasi NumPy melepas GIL, jadi job berjalan paralel dengan script Streamlit."""
+
+    def __init__(self, maks_worker=MAKS_WORKER, maks_antrian=MAKS_ANTRIAN, maks_proses=MAKS_PROSES):
+        self._pool = ThreadPoolExecutor(max_workers=maks_worker, thread_name_prefix='spk-job')
+        self.maks_antrian = maks_antrian
+        self.maks_proses = maks_proses
+        self._pool_proses = None
+        self._job = OrderedDict()
+        self._lock = threading.Lock()
+
+    def pool_proses(self):
+        """Process pool bersama untuk job yang memecah kerjanya ke beberapa proses, dibuat saat pertama dipakai.
+
+        Satu pool untuk semua job, jadi jumlah proses tetap maks_proses berapa pun job yang berjalan.
+        Konteks 'spawn' karena pool dipakai dari thread (fork dari proses multi-thread tidak aman)."""
+        with self._lock:
+            if self._pool_proses is None:
+                self._pool_proses = ProcessPoolExecutor(self.maks_proses, mp_context=multiprocessing.get_context('spawn'))
+            return self._pool_proses
+
+    def kirim(self, kunci, fungsi, *args, nama='', peminat=None, **kwargs):
+        """Jadwalkan fungsi(*args, **kwargs), atau kembalikan job yang sudah ada untuk kunci yang sama.
+
+        peminat: id sesi pengirim; kiriman ulang dari sesi yang sama tidak menambah peminat. Job yang
+        dibatalkan (termasuk yang masih menuntaskan langkah terakhirnya) atau gagal dijadwalkan ulang; job
+        selesai langsung dikembalikan beserta hasilnya."""
+        with self._lock:
+            job = self._job.get(kunci)
+            # Job yang sudah diminta batal tetap JALAN sampai langkah berikutnya; jangan dipakai ulang
+            if job is not None and job.status not in (BATAL, GAGAL) and not job._batal.is_set():
+                self._job.move_to_end(kunci)
+                job.peminat.add(peminat)
+                return job
+            if sum(j.aktif() for j in self._job.values()) >= self.maks_antrian:
+                raise AntrianPenuh(f"Antrian analisis penuh ({self.maks_antrian} job). Coba lagi nanti.")
+            job = Job(kunci, nama)
+            job.peminat.add(peminat)
+            self._job[kunci] = job
+            job._future = self._pool.submit(self._jalankan, job, fungsi, args, kwargs)
+            self._rapikan()
+        return job
+
+    def ambil(self, kunci):
+        with self._lock:
+            return self._job.get(kunci)
+
+    def lepas(self, job, peminat=None):
+        """Sesi berhenti menunggu job. Job dibatalkan hanya jika tidak ada sesi lain yang menunggunya.
+
+        Mengembalikan True jika job benar-benar dibatalkan."""
+        with self._lock:
+            job.peminat.discard(peminat)
+            if job.peminat or not job.aktif():
+                return False
+            job._batal.set()
+            if job._future.cancel():
+                # Belum sempat mulai: tidak akan pernah dijalankan oleh pool
+                job.status = BATAL
+                job.selesai = time.time()
+            return True
+
+    def _jalankan(self, job, fungsi, args, kwargs):
+        if job._batal.is_set():
+            job.status = BATAL
+            return
+        job.status = JALAN
+        job.mulai = time.time()
+        langkah = None
+        try:
+            langkah = fungsi(*args, **kwargs)
+            for progres, parsial in langkah:
+                job.parsial = parsial
+                job.progres = float(progres)
+                if job._batal.is_set():
+                    job.status = BATAL
+                    return
+            job.hasil = job.parsial
+            job.progres = 1.0
+            job.status = SELESAI
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = GAGAL
+        finally:
+            if langkah is not None:
+                langkah.close()
+            job.selesai = time.time()
+
+    def _rapikan(self):
+        # Buang job berakhir yang paling lama; job aktif tidak pernah dibuang
+        berakhir = [k for k, j in self._job.items() if not j.aktif()]
+        for k in berakhir[:max(0, len(berakhir) - MAKS_JOB_SIMPAN)]:
+            del self._job[k]
+
+    def statistik(self):
+        with self._lock:
+            jumlah = {}
+            for j in self._job.values():
+                jumlah[j.status] = jumlah.get(j.status, 0) + 1
+        return jumlah
+
+    def tutup(self, tunggu=True):
+        with self._lock:
+            for job in self._job.values():
+                job._batal.set()
+                if job._future.cancel():
+                    job.status = BATAL
+            pool_proses, self._pool_proses = self._pool_proses, None
+        self._pool.shutdown(wait=tunggu, cancel_futures=True)
+        if pool_proses is not None:
+            pool_proses.shutdown(wait=tunggu, cancel_futures=True)
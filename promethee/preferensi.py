@@ -0,0 +1,103 @@
+"""Registri fungsi preferensi PROMETHEE: enam tipe standar sebagai kernel tervektorisasi array-in/array-out.
+
+Setiap kernel menerima selisih d (array berdimensi bebas) dan parameter q, p, s (skalar, atau array yang
+di-broadcast ke sumbu terakhir d). Kernel yang piecewise-linear juga menyatakan dirinya sebagai kombinasi
+fungsi linear(q', p'), sehingga jalur terurut O(n log n) di engine bisa dipakai; kernel lain (Gaussian)
+dihitung lewat jalur pairwise ber-tile."""
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+FUNGSI_DEFAULT = 'linear'
+
+
+class FungsiPreferensi(NamedTuple):
+    nama: str
+    kernel: Callable              # kernel(d, q, p, s) -> array preferensi 0..1 berbentuk d
+    parameter: tuple              # parameter konfigurasi yang dipakai ('q', 'p', 's')
+    komponen: Optional[Callable]  # komponen(q, p, s) -> [(koefisien, q', p')] atau None jika tidak piecewise-linear
+
+
+def preferensi_linear(d, q, p):
+    """Fungsi preferensi linear (V-shape dengan indifference): 0 jika d <= q, 1 jika d > p.
+    q dan p boleh berupa array per kriteria yang di-broadcast ke sumbu terakhir d."""
+    if np.ndim(q) == 0 and np.ndim(p) == 0:
+        if p > q:
+            return np.clip((d - q) / (p - q), 0.0, 1.0)
+        return (d > q).astype(float)
+
+    lebar = np.asarray(p, dtype=float) - q
+    linear = np.clip((d - q) / np.where(lebar > 0, lebar, 1.0), 0.0, 1.0)
+    return np.where(lebar > 0, linear, d > q).astype(float)
+
+
+def _usual(d, q, p, s):
+    return (d > 0).astype(float)
+
+
+def _u_shape(d, q, p, s):
+    return (d > q).astype(float)
+
+
+def _v_shape(d, q, p, s):
+    return preferensi_linear(d, 0.0 * np.asarray(p), p)
+
+
+def _level(d, q, p, s):
+    return 0.5 * (d > q) + 0.5 * (d > np.maximum(p, q))
+
+
+def _linear(d, q, p, s):
+    return preferensi_linear(d, q, p)
+
+
+def _gaussian(d, q, p, s):
+    s = np.asarray(s, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        nilai = -np.expm1(-np.square(d) / (2.0 * np.square(s)))
+    # s <= 0 adalah limit fungsi usual
+    return np.where(d > 0, np.where(s > 0, nilai, 1.0), 0.0)
+
+
+REGISTRI = {}
+
+
+def daftarkan_fungsi(nama, kernel, parameter=(), komponen=None):
+    """Tambah tipe fungsi preferensi. kernel wajib tervektorisasi (tanpa loop per pasangan)."""
+    REGISTRI[nama] = FungsiPreferensi(nama, kernel, tuple(parameter), komponen)
+    return REGISTRI[nama]
+
+
+daftarkan_fungsi('usual', _usual, (), lambda q, p, s: [(1.0, 0.0, 0.0)])
+daftarkan_fungsi('u-shape', _u_shape, ('q',), lambda q, p, s: [(1.0, q, q)])
+daftarkan_fungsi('v-shape', _v_shape, ('p',), lambda q, p, s: [(1.0, 0.0, p)])
+daftarkan_fungsi('level', _level, ('q', 'p'), lambda q, p, s: [(0.5, q, q), (0.5, max(p, q), max(p, q))])
+daftarkan_fungsi('linear', _linear, ('q', 'p'), lambda q, p, s: [(1.0, q, p)])
+daftarkan_fungsi('gaussian', _gaussian, ('s',))
+
+
+def ambil_fungsi(nama):
+    try:
+        return REGISTRI[nama]
+    except KeyError:
+        raise ValueError(f"Fungsi preferensi tidak dikenal: {nama}. Pilihan: {list(REGISTRI)}") from None
+
+
+def preferensi(d, fungsi, q=0.0, p=0.0, s=0.0):
+    """Preferensi satu kriteria (parameter skalar) untuk array selisih d."""
+    return ambil_fungsi(fungsi).kernel(d, q, p, s)
+
+
+def preferensi_kolom(D, fungsi, q, p, s):
+    """Preferensi untuk D (..., k) dengan fungsi dan parameter per kriteria di sumbu terakhir.
+
+    Kolom dikelompokkan per tipe fungsi, jadi jumlah pemanggilan kernel = jumlah tipe yang dipakai."""
+    fungsi = np.asarray(fungsi, dtype=object)
+    tipe = set(fungsi.tolist())
+    if len(tipe) == 1:
+        return ambil_fungsi(tipe.pop()).kernel(D, q, p, s).astype(float)
+    hasil = np.empty(D.shape)
+    for nama in tipe:
+        kolom = np.flatnonzero(fungsi == nama)
+        hasil[..., kolom] = ambil_fungsi(nama).kernel(D[..., kolom], q[kolom], p[kolom], s[kolom])
+    return hasil
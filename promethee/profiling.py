@@ -0,0 +1,154 @@
+"""Instrumentasi per tahap (wall time, CPU time, alokasi puncak) dengan ekspor JSONL dan Prometheus.
+
+Saat tidak aktif, Profiler.tahap() mengembalikan context manager no-op bersama sehingga overhead
+hanya satu pemanggilan fungsi per tahap. CPU time diukur per thread (time.thread_time), jadi sesi
+lain dan job latar tidak ikut terhitung.
+
+tracemalloc bersifat global per proses: selama ada profiler yang mengukur memori, alokasi semua sesi
+ikut dilacak (lebih lambat), dan alokasi puncak sebuah tahap mencakup alokasi thread lain yang berjalan
+bersamaan. Karena itu pengukuran memori hanya aktif jika operator menyalakan SPK_PROFILE; profiler per
+sesi (?debug=1) hanya mengukur waktu. tracemalloc dinyalakan/dimatikan dengan hitungan rujukan, sehingga
+satu sesi tidak mematikannya selagi sesi lain masih di tengah tahap. Tahap tidak boleh bersarang: alokasi
+puncak diukur dengan tracemalloc.reset_peak() di awal tiap tahap."""
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from pathlib import Path
+
+ENV_AKTIF = 'SPK_PROFILE'
+ENV_DIREKTORI = 'SPK_PROFILE_DIR'
+DIREKTORI_DEFAULT = 'metrics'
+FILE_JSONL = 'profil.jsonl'
+FILE_PROMETHEUS = 'spk_tambang.prom'
+
+_NOOP = contextlib.nullcontext()
+_lock = threading.Lock()
+# Akumulasi per tahap sepanjang umur proses, untuk counter Prometheus
+_total = {}
+# Jumlah profiler yang sedang memegang tracemalloc, dan apakah tracemalloc dinyalakan oleh modul ini
+_pemegang_tracemalloc = 0
+_tracemalloc_milik_profiler = False
+
+
+def aktif_dari_env():
+    return os.environ.get(ENV_AKTIF, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def _pegang_tracemalloc():
+    global _pemegang_tracemalloc, _tracemalloc_milik_profiler
+    with _lock:
+        if _pemegang_tracemalloc == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_milik_profiler = True
+        _pemegang_tracemalloc += 1
+
+
+def _lepas_tracemalloc():
+    global _pemegang_tracemalloc, _tracemalloc_milik_profiler
+    with _lock:
+        _pemegang_tracemalloc -= 1
+        # tracemalloc yang dinyalakan pihak lain (mis. PYTHONTRACEMALLOC) dibiarkan menyala
+        if _pemegang_tracemalloc == 0 and _tracemalloc_milik_profiler:
+            tracemalloc.stop()
+            _tracemalloc_milik_profiler = False
+
+
+class _Tahap:
+    __slots__ = ('profiler', 'nama', 'wall', 'cpu', 'mem_awal')
+
+    def __init__(self, profiler, nama):
+        self.profiler = profiler
+        self.nama = nama
+
+    def __enter__(self):
+        self.mem_awal = None
+        if self.profiler.ukur_memori:
+            self.profiler._pegang_memori()
+            self.mem_awal = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.cpu = time.thread_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.thread_time() - self.cpu
+        puncak = None
+        if self.mem_awal is not None:
+            puncak = max(tracemalloc.get_traced_memory()[1] - self.mem_awal, 0)
+        self.profiler.catatan.append({'tahap': self.nama, 'wall_s': wall, 'cpu_s': cpu, 'puncak_bytes': puncak})
+        return False
+
+
+class Profiler:
+    def __init__(self, aktif=None, label='', ukur_memori=None):
+        """ukur_memori: lacak alokasi puncak dengan tracemalloc (default: hanya jika SPK_PROFILE menyala)."""
+        self.aktif = aktif_dari_env() if aktif is None else aktif
+        self.ukur_memori = self.aktif and (aktif_dari_env() if ukur_memori is None else ukur_memori)
+        self.label = label
+        self.catatan = []
+        self._pelepas = None
+
+    def _pegang_memori(self):
+        if self._pelepas is None:
+            _pegang_tracemalloc()
+            # Tetap dilepas walau rerun terhenti sebelum simpan() (st.stop, exception)
+            self._pelepas = weakref.finalize(self, _lepas_tracemalloc)
+
+    def lepas_tracemalloc(self):
+        if self._pelepas is not None:
+            self._pelepas()
+            self._pelepas = None
+
+    def tahap(self, nama):
+        if not self.aktif:
+            return _NOOP
+        return _Tahap(self, nama)
+
+    def total_wall(self):
+        return sum(c['wall_s'] for c in self.catatan)
+
+    def simpan(self, direktori=None):
+        """Tambahkan catatan rerun ini ke log JSONL dan tulis ulang file teks Prometheus."""
+        # tracemalloc memperlambat seluruh proses; dimatikan setelah profiler terakhir selesai
+        self.lepas_tracemalloc()
+        if not self.aktif or not self.catatan:
+            return
+        direktori = Path(direktori or os.environ.get(ENV_DIREKTORI, DIREKTORI_DEFAULT))
+        direktori.mkdir(parents=True, exist_ok=True)
+        baris = {'waktu': time.time(), 'label': self.label, 'pid': os.getpid(), 'tahap': self.catatan}
+
+        with _lock:
+            with open(direktori / FILE_JSONL, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(baris) + '\n')
+            for c in self.catatan:
+                t = _total.setdefault(c['tahap'], {'jumlah': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'puncak_bytes': 0})
+                t['jumlah'] += 1
+                t['wall_s'] += c['wall_s']
+                t['cpu_s'] += c['cpu_s']
+                if c['puncak_bytes'] is not None:
+                    t['puncak_bytes'] = c['puncak_bytes']
+            tulis_prometheus(direktori / FILE_PROMETHEUS, _total)
+
+
+def tulis_prometheus(path, total):
+    """Format teks Prometheus untuk textfile collector node exporter (ditulis atomik via rename)."""
+    metrik = [
+        ('spk_stage_runs_total', 'counter', 'Jumlah eksekusi tahap', 'jumlah'),
+        ('spk_stage_wall_seconds_total', 'counter', 'Total wall time per tahap', 'wall_s'),
+        ('spk_stage_cpu_seconds_total', 'counter', 'Total CPU time thread sesi per tahap', 'cpu_s'),
+        ('spk_stage_peak_bytes', 'gauge', 'Alokasi puncak (tracemalloc) eksekusi terakhir', 'puncak_bytes'),
+    ]
+    baris = []
+    for nama, tipe, bantuan, kunci in metrik:
+        baris.append(f'# HELP {nama} {bantuan}')
+        baris.append(f'# TYPE {nama} {tipe}')
+        for tahap, nilai in sorted(total.items()):
+            baris.append(f'{nama}{{stage="{tahap}"}} {nilai[kunci]}')
+    sementara = Path(f'{path}.{os.getpid()}.tmp')
+    sementara.write_text('\n'.join(baris) + '\n', encoding='utf-8')
+    os.replace(sementara, path)
@@ -0,0 +1,220 @@
+"""Analisis robustness Monte Carlo: indeks akseptabilitas peringkat dari skor dan bobot yang diganggu."""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .engine import AMBANG_N_BESAR, ELEMEN_PER_TILE, flow_kriteria, flow_unikriteria, pilih_metode, siapkan_matriks
+from .preferensi import preferensi
+
+# Tingkat rubrik penilaian (lihat RUBRIK_PENILAIAN): batas atas skor tiap tingkat
+TINGKAT_RUBRIK = (('Low', 49), ('Mid', 75), ('High', 100))
+# Ketidakpastian skor (+/- poin) per tingkat rubrik
+BAND_DEFAULT = {'Low': 5.0, 'Mid': 5.0, 'High': 5.0}
+BATAS_SKOR = (0.0, 100.0)
+
+UKURAN_CHUNK = 10_000
+# Chunk lebih kecil untuk job latar agar progres dan hasil parsial sering diperbarui
+UKURAN_CHUNK_BERTAHAP = 2_000
+# Di bawah jumlah sampel ini process pool tidak sebanding dengan overhead-nya
+MIN_SAMPEL_PARALEL = 20_000
+# Di atas jumlah alternatif ini gangguan skor (flow ulang per sampel) terlalu mahal untuk panel interaktif
+MAKS_N_GANGGUAN_SKOR = AMBANG_N_BESAR
+# Di atas jumlah alternatif ini akseptabilitas hanya dicatat untuk peringkat 1..MAKS_PERINGKAT agar memori
+# O(n . R), bukan O(n^2); sampai ambang ini tabel n x n masih kecil dan semua peringkat ditampilkan
+AMBANG_PERINGKAT_PENUH = 100
+MAKS_PERINGKAT = 10
+
+
+class HasilRobustness(NamedTuple):
+    akseptabilitas: pd.DataFrame   # n x R: peluang alternatif menempati peringkat ke-r (r <= R)
+    peluang_juara: pd.Series
+    peringkat_harapan: pd.Series
+    n_sampel: int
+
+
+def band_per_sel(skor, band=None):
+    """Matriks band gangguan (n x k) sesuai tingkat rubrik dari skor mentah. band: angka atau dict per tingkat."""
+    if isinstance(band, (int, float)):
+        band = {t: float(band) for t, _ in TINGKAT_RUBRIK}
+    band = {**BAND_DEFAULT, **(band or {})}
+    batas = np.array([b for _, b in TINGKAT_RUBRIK], dtype=float)
+    nilai_band = np.array([band[t] for t, _ in TINGKAT_RUBRIK], dtype=float)
+    tingkat = np.minimum(np.searchsorted(batas, skor, side='left'), len(batas) - 1)
+    return nilai_band[tingkat]
+
+
+def _flow_batch(X, fungsi, q, p, s):
+    """Jumlah preferensi keluar/masuk untuk B sampel sekaligus (X: B x n x k, sudah diorientasikan)."""
+    B, n, k = X.shape
+    leaving = np.empty((B, n, k))
+    entering = np.empty((B, n, k))
+    diag = np.arange(n)
+    for c in range(k):
+        pref = preferensi(X[:, :, None, c] - X[:, None, :, c], fungsi[c], q[c], p[c], s[c])
+        pref[:, diag, diag] = 0.0
+        leaving[:, :, c] = pref.sum(axis=2)
+        entering[:, :, c] = pref.sum(axis=1)
+    return leaving, entering
+
+
+def _flow_sampel(X, fungsi, q, p, s):
+    """Versi per sampel dengan algoritma terurut untuk n besar."""
+    leaving = np.empty(X.shape)
+    entering = np.empty(X.shape)
+    for b in range(X.shape[0]):
+        for c in range(X.shape[2]):
+            leaving[b, :, c], entering[b, :, c] = flow_kriteria(X[b, :, c], fungsi[c], q[c], p[c], s[c], 'terurut')
+    return leaving, entering
+
+
+def _sampel_bobot(rng, bobot, konsentrasi, jumlah):
+    if konsentrasi is None:
+        return np.broadcast_to(bobot, (jumlah, len(bobot)))
+    aktif = bobot > 0
+    W = np.zeros((jumlah, len(bobot)))
+    W[:, aktif] = rng.dirichlet(konsentrasi * bobot[aktif] / bobot[aktif].sum(), size=jumlah) * bobot.sum()
+    return W
+
+
+def _hitung_peringkat(phi, hitung, jumlah_peringkat):
+    """Tambahkan frekuensi peringkat 1..R batch phi (B x n) ke hitung (n x R) dan jumlah peringkat ke jumlah_peringkat (n)."""
+    B, n = phi.shape
+    R = hitung.shape[1]
+    urutan = np.argsort(-phi, axis=1, kind='stable')
+    posisi = np.broadcast_to(np.arange(R), (B, R))
+    hitung += np.bincount((urutan[:, :R] * R + posisi).ravel(), minlength=n * R).reshape(n, R)
+    peringkat = np.empty_like(urutan)
+    np.put_along_axis(peringkat, urutan, np.arange(1, n + 1)[None, :], axis=1)
+    jumlah_peringkat += peringkat.sum(axis=0)
+
+
+def _kerjakan_chunk(args):
+    skor, arah, bobot, parameter, band, konsentrasi, jumlah, seed, flow_tetap, R = args
+    rng = np.random.default_rng(seed)
+    n, k = skor.shape
+    hitung = np.zeros((n, R), dtype=np.int64)
+    jumlah_peringkat = np.zeros(n, dtype=np.int64)
+    besar = pilih_metode(n) == 'terurut'
+    # Tanpa gangguan skor satu sampel hanya butuh n elemen phi, bukan n x n preferensi
+    elemen_sampel = n if flow_tetap is not None else n * n
+    ukuran_batch = max(1, min(jumlah, ELEMEN_PER_TILE // max(elemen_sampel, 1)))
+
+    for awal in range(0, jumlah, ukuran_batch):
+        B = min(ukuran_batch, jumlah - awal)
+        W = _sampel_bobot(rng, bobot, konsentrasi, B)
+        if flow_tetap is not None:
+            # Hanya bobot yang diganggu: phi = F . w untuk seluruh batch dalam satu perkalian
+            phi = W @ flow_tetap.T
+        else:
+            X = skor + rng.uniform(-1.0, 1.0, size=(B, n, k)) * band
+            np.clip(X, *BATAS_SKOR, out=X)
+            X *= arah
+            leaving, entering = (_flow_sampel if besar else _flow_batch)(X, *parameter)
+            phi = np.einsum('bnk,bk->bn', leaving - entering, W)
+        _hitung_peringkat(phi, hitung, jumlah_peringkat)
+    return hitung, jumlah_peringkat
+
+
+def _siapkan_tugas(df, kriteria_config, n_sampel, band, konsentrasi, seed, ukuran_chunk, maks_peringkat):
+    mk = siapkan_matriks(df, kriteria_config)
+    skor = mk.nilai * mk.arah
+    band_sel = band_per_sel(skor, band)
+
+    flow_tetap = None
+    if not band_sel.any():
+        leaving, entering = flow_unikriteria(mk)
+        flow_tetap = leaving - entering
+
+    jumlah_chunk = -(-n_sampel // ukuran_chunk)
+    seeds = np.random.SeedSequence(seed).spawn(jumlah_chunk)
+    n = len(mk.index)
+    R = n if maks_peringkat is None or n <= AMBANG_PERINGKAT_PENUH else min(maks_peringkat, n)
+    tugas = [
+        (skor, mk.arah, mk.bobot, (mk.fungsi, mk.q, mk.p, mk.s), band_sel, konsentrasi,
+         min(ukuran_chunk, n_sampel - i * ukuran_chunk), seeds[i], flow_tetap, R)
+        for i in range(jumlah_chunk)
+    ]
+    return mk.index, tugas
+
+
+def analisis_robustness(df, kriteria_config, n_sampel=10_000, band=None, konsentrasi=200.0,
+                        seed=0, n_proses=None, ukuran_chunk=UKURAN_CHUNK, maks_peringkat=MAKS_PERINGKAT):
+    """Sampling Monte Carlo skor (+/- band per tingkat rubrik) dan bobot (Dirichlet di sekitar bobot).
+
+    band=0 mematikan gangguan skor, konsentrasi=None mematikan gangguan bobot. Setiap chunk memakai
+    seed turunan SeedSequence(seed), jadi hasil sama berapa pun jumlah proses. Frekuensi peringkat
+    diakumulasi per chunk sehingga memori tidak bertambah dengan jumlah sampel. Akseptabilitas dicatat
+    untuk semua peringkat, atau hanya 1..maks_peringkat jika n > AMBANG_PERINGKAT_PENUH (None = selalu
+    semua); peringkat harapan tetap dihitung dari semua peringkat."""
+    index, tugas = _siapkan_tugas(df, kriteria_config, n_sampel, band, konsentrasi, seed, ukuran_chunk, maks_peringkat)
+
+    if n_proses is None:
+        n_proses = os.cpu_count() or 1
+    if n_proses > 1 and n_sampel >= MIN_SAMPEL_PARALEL and len(tugas) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_proses, len(tugas))) as pool:
+            bagian = list(pool.map(_kerjakan_chunk, tugas))
+    else:
+        bagian = [_kerjakan_chunk(t) for t in tugas]
+
+    return susun_hasil_robustness(index, sum(h for h, _ in bagian), sum(j for _, j in bagian))
+
+
+def robustness_bertahap(df, kriteria_config, n_sampel=10_000, band=None, konsentrasi=200.0,
+                        seed=0, n_proses=None, ukuran_chunk=UKURAN_CHUNK_BERTAHAP, maks_peringkat=MAKS_PERINGKAT,
+                        pool=None):
+    """Generator untuk job latar: yield (progres, HasilRobustness parsial) setiap satu chunk selesai.
+
+    Chunk dikerjakan paralel di process pool dan diakumulasi sesuai urutan selesai; hasil akhir identik
+    dengan analisis_robustness dengan seed dan ukuran_chunk yang sama. pool: process pool bersama
+    (JobRunner.pool_proses) agar jumlah proses terbatas untuk semua job; tanpa pool, dibuat pool sendiri
+    dengan n_proses worker. Menutup generator (pembatalan job) membatalkan chunk yang belum mulai."""
+    index, tugas = _siapkan_tugas(df, kriteria_config, n_sampel, band, konsentrasi, seed, ukuran_chunk, maks_peringkat)
+    n = len(index)
+    hitung = np.zeros((n, tugas[0][9] if tugas else 0), dtype=np.int64)
+    jumlah_peringkat = np.zeros(n, dtype=np.int64)
+    selesai = 0
+
+    if n_proses is None:
+        n_proses = os.cpu_count() or 1
+    if n_sampel < MIN_SAMPEL_PARALEL or len(tugas) <= 1 or (pool is None and n_proses <= 1):
+        for t in tugas:
+            h, j = _kerjakan_chunk(t)
+            hitung += h
+            jumlah_peringkat += j
+            selesai += t[6]
+            yield selesai / n_sampel, susun_hasil_robustness(index, hitung, jumlah_peringkat)
+        return
+
+    milik_sendiri = pool is None
+    if milik_sendiri:
+        # Generator ini berjalan di thread JobRunner: 'spawn' menghindari fork dari proses multi-thread
+        pool = ProcessPoolExecutor(max_workers=min(n_proses, len(tugas)), mp_context=multiprocessing.get_context('spawn'))
+    futures = {}
+    try:
+        futures = {pool.submit(_kerjakan_chunk, t): t[6] for t in tugas}
+        for f in as_completed(futures):
+            h, j = f.result()
+            hitung += h
+            jumlah_peringkat += j
+            selesai += futures[f]
+            yield selesai / n_sampel, susun_hasil_robustness(index, hitung, jumlah_peringkat)
+    finally:
+        # Pool bersama tetap hidup untuk job lain; cukup batalkan chunk milik job ini yang belum mulai
+        for f in futures:
+            f.cancel()
+        if milik_sendiri:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def susun_hasil_robustness(index, hitung, jumlah_peringkat):
+    n, R = hitung.shape
+    # Tiap sampel tepat satu juara, jadi jumlah kolom peringkat 1 = jumlah sampel
+    total = max(int(hitung[:, 0].sum()) if R else 0, 1)
+    akseptabilitas = pd.DataFrame(hitung / total, index=index, columns=[f'Peringkat {r + 1}' for r in range(R)])
+    peluang_juara = akseptabilitas.iloc[:, 0].rename('Peluang Juara') if R else pd.Series(dtype=float)
+    peringkat_harapan = pd.Series(jumlah_peringkat / total, index=index, name='Peringkat Harapan')
+    return HasilRobustness(akseptabilitas, peluang_juara, peringkat_harapan, total)
@@ -0,0 +1,159 @@
+"""Evaluasi banyak skenario bobot sekaligus dari net flow unikriteria yang di-cache per dataset."""
+import copy
+import hashlib
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import CacheLRU
+from .engine import flow_unikriteria, siapkan_matriks, susun_hasil
+from .gaia import promethee_i, proyeksi_gaia
+
+MAKS_CACHE_EVALUATOR = 8
+# Tiap evaluator memegang tiga array n x k float64 (leaving, entering, flow)
+MAKS_BYTES_EVALUATOR = 512 * 1024 * 1024
+# Dipakai bersama oleh semua sesi (thread); CacheLRU mengunci get/set
+_cache_evaluator = CacheLRU(maks_entri=MAKS_CACHE_EVALUATOR, maks_bytes=MAKS_BYTES_EVALUATOR)
+
+
+class HasilSkenarioBobot(NamedTuple):
+    net_flow: np.ndarray    # n x m, satu kolom per vektor bobot
+    peringkat: np.ndarray   # m x n, posisi alternatif dari terbaik ke terburuk (None jika tidak diminta)
+    juara: np.ndarray       # m, posisi alternatif terbaik
+    gap: np.ndarray         # m, selisih net flow juara vs runner-up
+
+
+def hash_matriks(mk):
+    """Hash isi dataset + fungsi preferensi dan parameternya (bobot tidak ikut karena flow unikriteria tidak bergantung padanya)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((list(mk.kolom), list(map(str, mk.index)), list(mk.fungsi))).encode())
+    for arr in (mk.nilai, mk.q, mk.p, mk.s):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()
+
+
+class EvaluatorBobot:
+    """phi = sum_k w_k . phi_k, jadi matriks phi_k (n x k) cukup dihitung sekali per dataset.
+
+    Evaluator di cache dibagi antar sesi dan tidak pernah diubah; bobot pemanggil dipasang pada salinan
+    dangkal lewat dengan_bobot(), atau diberikan langsung ke hasil()/promethee_i()."""
+
+    def __init__(self, mk, kriteria_config, metode='auto', flow=None):
+        n = len(mk.index)
+        leaving, entering = flow_unikriteria(mk, metode) if flow is None else flow
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.leaving = leaving / (n - 1)
+            self.entering = entering / (n - 1)
+        self.flow = self.leaving - self.entering
+        self.index = mk.index
+        self.kolom = mk.kolom
+        self.bobot = mk.bobot
+        self.nama_kriteria = [kriteria_config[k]['nama'] for k in mk.kolom]
+        # Dibagi oleh semua salinan dengan_bobot() dari evaluator ini
+        self._turunan = {}
+
+    @property
+    def nbytes(self):
+        """Ukuran array yang dipegang evaluator, untuk batas memori cache."""
+        proyeksi = self._turunan.get('gaia')
+        ekstra = proyeksi.koordinat.nbytes + proyeksi.sumbu.nbytes if proyeksi is not None else 0
+        return self.leaving.nbytes + self.entering.nbytes + self.flow.nbytes + ekstra
+
+    def dengan_bobot(self, bobot):
+        """Salinan dangkal dengan bobot lain; array flow dan cache GAIA tetap dibagi, tanpa salinan data."""
+        salinan = copy.copy(self)
+        salinan.bobot = np.asarray(bobot, dtype=float)
+        return salinan
+
+    def gaia(self):
+        """Proyeksi GAIA di-cache bersama evaluator (per dataset); hanya tongkat keputusan yang ikut bobot."""
+        proyeksi = self._turunan.get('gaia')
+        if proyeksi is None:
+            proyeksi = self._turunan.setdefault('gaia', proyeksi_gaia(self.flow))
+        return proyeksi
+
+    def hasil(self, bobot=None):
+        """Tabel hasil PROMETHEE II untuk bobot (default: bobot evaluator), tanpa menghitung ulang flow."""
+        w = self.bobot if bobot is None else bobot
+        return susun_hasil(self.index, self.leaving @ w, self.entering @ w)
+
+    def promethee_i(self, bobot=None):
+        w = self.bobot if bobot is None else bobot
+        return promethee_i(self.index, self.leaving @ w, self.entering @ w)
+
+    def normalisasi(self, W):
+        W = np.atleast_2d(np.asarray(W, dtype=float))
+        if W.shape[1] != len(self.kolom):
+            raise ValueError(f"Vektor bobot harus berisi {len(self.kolom)} nilai (kolom: {self.kolom})")
+        total = W.sum(axis=1, keepdims=True)
+        return np.divide(W, total, out=np.zeros_like(W), where=total > 0)
+
+    def evaluasi(self, W, dengan_peringkat=True):
+        """Evaluasi m vektor bobot (m x k) dalam satu perkalian matriks."""
+        phi = self.flow @ self.normalisasi(W).T
+        n = phi.shape[0]
+        juara = phi.argmax(axis=0)
+        if n > 1:
+            dua_teratas = -np.partition(-phi, 1, axis=0)[:2]
+            gap = dua_teratas[0] - dua_teratas[1]
+        else:
+            gap = np.zeros(phi.shape[1])
+        peringkat = np.argsort(-phi, axis=0, kind='stable').T if dengan_peringkat else None
+        return HasilSkenarioBobot(phi, peringkat, juara, gap)
+
+    def sapuan(self, kriteria, titik=101):
+        """Net flow semua alternatif ketika bobot satu kriteria disapu 0..1 (bobot lain diskalakan proporsional)."""
+        c = self.kolom.index(kriteria)
+        t = np.linspace(0.0, 1.0, titik)
+        lain = self.bobot.copy()
+        lain[c] = 0.0
+        total_lain = lain.sum()
+        lain = lain / total_lain if total_lain > 0 else lain
+        W = (1 - t)[:, None] * lain[None, :]
+        W[:, c] = t
+        return t, self.evaluasi(W, dengan_peringkat=False).net_flow
+
+    def interval_stabilitas(self, tingkat='penuh'):
+        """Interval bobot tiap kriteria yang mempertahankan peringkat ('penuh') atau juara ('juara').
+
+        Bobot kriteria c diganti t dan bobot lain diskalakan (1 - t) / (1 - w_c), sehingga net flow
+        tiap alternatif linear terhadap t. Batas interval adalah titik potong selisih net flow antar
+        pasangan yang harus tetap tidak negatif."""
+        if tingkat not in ('penuh', 'juara'):
+            raise ValueError("tingkat harus 'penuh' atau 'juara'")
+        total = self.bobot.sum()
+        w = self.bobot / total if total > 0 else self.bobot
+        urutan = np.argsort(-(self.flow @ w), kind='stable')
+        if tingkat == 'penuh':
+            atas, bawah = urutan[:-1], urutan[1:]
+        else:
+            atas, bawah = np.full(len(urutan) - 1, urutan[0]), urutan[1:]
+
+        baris = []
+        for c, kode in enumerate(self.kolom):
+            sisa = 1.0 - w[c]
+            lain = np.delete(self.flow, c, axis=1) @ np.delete(w, c)
+            B = lain / sisa if sisa > 0 else np.zeros_like(lain)
+            A = self.flow[:, c]
+            potong = B[atas] - B[bawah]
+            kemiringan = (A[atas] - A[bawah]) - potong
+            with np.errstate(divide='ignore', invalid='ignore'):
+                akar = -potong / kemiringan
+            naik = kemiringan > 0
+            turun = kemiringan < 0
+            batas_bawah = max(0.0, akar[naik].max()) if naik.any() else 0.0
+            batas_atas = min(1.0, akar[turun].min()) if turun.any() else 1.0
+            baris.append({'Kode': kode, 'Nama': self.nama_kriteria[c], 'Bobot': w[c], 'Min': batas_bawah, 'Maks': batas_atas})
+        return pd.DataFrame(baris)
+
+
+def evaluator_bobot(df, kriteria_config, metode='auto', flow=None):
+    """EvaluatorBobot yang di-cache berdasarkan isi dataset dan parameter fungsi preferensi.
+
+    flow: (leaving, entering) yang sudah dihitung untuk df ini; dipakai jika belum ada di cache.
+    Yang dikembalikan adalah salinan dangkal berbobot kriteria_config, jadi bobot boleh berbeda antar
+    pemanggil tanpa menghitung ulang flow unikriteria dan tanpa mengubah evaluator bersama."""
+    mk = siapkan_matriks(df, kriteria_config)
+    evaluator = _cache_evaluator.get_or_compute(hash_matriks(mk), lambda: EvaluatorBobot(mk, kriteria_config, metode, flow))
+    return evaluator.dengan_bobot(mk.bobot)
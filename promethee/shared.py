@@ -0,0 +1,286 @@
+"""Dataset bersama antar sesi: satu salinan read-only per isi data, sesi hanya memegang handle + overlay editan.
+
+Sesi yang membuka workbook yang sama berbagi satu array skor n x k. Editan sesi disimpan sebagai overlay
+jarang (baris diubah/dihapus/ditambah) di atas dataset bersama; jika overlay terlalu besar, sesi memisahkan
+diri ke dataset bersama baru (copy-on-write) yang juga didedup berdasarkan isi. Dataset tanpa rujukan
+tetap disimpan sampai anggaran memori terlampaui, lalu dikeluarkan mulai dari yang paling lama tidak dipakai.
+
+State turunan per sesi yang tidak bisa dibagi (mis. flow inkremental setelah editan, n x k per sesi)
+dipesan lewat HandleDataset.pesan_state() dan dihitung terhadap anggaran yang sama."""
+import hashlib
+import json
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+ENV_ANGGARAN = 'SPK_DATASET_BUDGET_MB'
+ANGGARAN_DEFAULT = 512 * 1024 * 1024
+# Overlay yang mencakup lebih dari fraksi baris ini dipisahkan menjadi dataset bersama baru
+MAKS_FRAKSI_OVERLAY = 0.25
+
+
+def _ke_array(df_skor, dtype=None):
+    """Skor sebagai array float C-contiguous.
+
+    Tanpa dtype, skor dipadatkan ke float32 hanya jika semua nilai terwakili tepat (mis. skor rubrik bulat),
+    sama seperti ingest; skor desimal tetap float64 sehingga tidak ada presisi yang hilang."""
+    if not all(pd.api.types.is_numeric_dtype(t) for t in df_skor.dtypes):
+        df_skor = df_skor.apply(pd.to_numeric, errors='coerce')
+    nilai = np.ascontiguousarray(df_skor.to_numpy(dtype=np.float64 if dtype is None else dtype, na_value=np.nan))
+    if dtype is None:
+        padat = nilai.astype(np.float32)
+        if np.array_equal(padat, nilai, equal_nan=True):
+            return padat
+    return nilai
+
+
+def _hash_dataset(nama_index, label, kolom, nilai):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([str(nama_index), [str(k) for k in kolom], str(nilai.dtype), nilai.shape]).encode())
+    h.update(pd.util.hash_pandas_object(pd.Index(label), index=False).to_numpy().tobytes())
+    h.update(nilai.tobytes())
+    return h.hexdigest()
+
+
+class DatasetBersama:
+    """Satu dataset immutable. Array skor ditandai read-only sehingga tidak ada sesi yang bisa menulisinya."""
+
+    def __init__(self, digest, nama_index, label, kolom, nilai):
+        nilai.setflags(write=False)
+        self.digest = digest
+        self.label = pd.Index(label, name=nama_index, dtype=object)
+        self.kolom = list(kolom)
+        self.nilai = nilai
+        self.rujukan = 0
+        self.nbytes = int(nilai.nbytes + self.label.memory_usage(deep=True))
+
+    def frame(self):
+        # Tanpa salinan: DataFrame membungkus array bersama langsung
+        return pd.DataFrame(self.nilai, index=self.label, columns=self.kolom, copy=False)
+
+
+class DatasetStore:
+    """Registri dataset bersama thread-safe dengan hitungan rujukan dan anggaran memori."""
+
+    def __init__(self, maks_bytes=None):
+        if maks_bytes is None:
+            mb = os.environ.get(ENV_ANGGARAN)
+            maks_bytes = int(float(mb) * 1024 * 1024) if mb else ANGGARAN_DEFAULT
+        self.maks_bytes = maks_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.bytes_sesi = 0
+        self.hit = 0
+        self.miss = 0
+        self.eviksi = 0
+
+    def daftarkan(self, df, kunci=None):
+        """Handle ke dataset bersama berisi df (kolom pertama = nama alternatif, sisanya skor).
+
+        kunci: identitas baris di editor (default posisi baris), dipakai untuk memetakan editan ke overlay."""
+        entri = self._ambil(df.columns[0], df.iloc[:, 0].to_numpy(dtype=object), list(df.columns[1:]), _ke_array(df.iloc[:, 1:]))
+        return HandleDataset(self, entri, kunci)
+
+    def _ambil(self, nama_index, label, kolom, nilai):
+        digest = _hash_dataset(nama_index, label, kolom, nilai)
+        with self._lock:
+            entri = self._data.get(digest)
+            if entri is None:
+                self.miss += 1
+                entri = DatasetBersama(digest, nama_index, label, kolom, nilai)
+                self._data[digest] = entri
+                self.total_bytes += entri.nbytes
+            else:
+                self.hit += 1
+                self._data.move_to_end(digest)
+            entri.rujukan += 1
+            self._eviksi()
+        return entri
+
+    def lepas(self, digest):
+        with self._lock:
+            entri = self._data.get(digest)
+            if entri is not None:
+                entri.rujukan -= 1
+                self._eviksi()
+
+    def pesan(self, nbytes):
+        """Catat nbytes state per sesi ke anggaran. False jika tetap tidak muat setelah eviksi dataset tanpa rujukan."""
+        with self._lock:
+            self.total_bytes += nbytes
+            self.bytes_sesi += nbytes
+            self._eviksi()
+            if self.total_bytes > self.maks_bytes:
+                self.total_bytes -= nbytes
+                self.bytes_sesi -= nbytes
+                return False
+            return True
+
+    def kembalikan(self, nbytes):
+        with self._lock:
+            self.total_bytes -= nbytes
+            self.bytes_sesi -= nbytes
+
+    def _eviksi(self):
+        # Hanya dataset tanpa rujukan yang boleh dikeluarkan; dataset yang masih dipakai sesi tetap tinggal
+        if self.total_bytes <= self.maks_bytes:
+            return
+        for digest in [d for d, e in self._data.items() if e.rujukan <= 0]:
+            self.total_bytes -= self._data.pop(digest).nbytes
+            self.eviksi += 1
+            if self.total_bytes <= self.maks_bytes:
+                break
+
+    def __len__(self):
+        return len(self._data)
+
+    def statistik(self):
+        with self._lock:
+            return {
+                'dataset': len(self._data), 'bytes': self.total_bytes, 'bytes_sesi': self.bytes_sesi, 'maks_bytes': self.maks_bytes,
+                'dirujuk': sum(e.rujukan > 0 for e in self._data.values()),
+                'rujukan': sum(e.rujukan for e in self._data.values()),
+                'hit': self.hit, 'miss': self.miss, 'eviksi': self.eviksi,
+            }
+
+
+class HandleDataset:
+    """Data milik satu sesi: rujukan ke dataset bersama plus overlay editan sesi tersebut.
+
+    Overlay berisi baris basis yang diubah (posisi -> (label, skor)), posisi baris yang dihapus, dan
+    baris tambahan (kunci, label, skor). Rujukan dilepas otomatis saat handle dibuang bersama sesinya."""
+
+    def __init__(self, store, entri, kunci=None):
+        self._store = store
+        self._pelepas_state = None
+        self.bytes_state = 0
+        self._pasang(entri, kunci)
+
+    def _pasang(self, entri, kunci):
+        self.entri = entri
+        n = len(entri.label)
+        # None berarti kunci = posisi baris, tanpa menyimpan array tambahan per sesi
+        self._kunci_basis = None if kunci is None or pd.Index(kunci).equals(pd.RangeIndex(n)) else pd.Index(kunci)
+        self.ubahan = {}
+        self.hapus = set()
+        self.tambahan = []
+        self._finalizer = weakref.finalize(self, self._store.lepas, entri.digest)
+
+    def _pisah(self, df_baru):
+        """Copy-on-write: jadikan isi df_baru dataset bersama baru dan lepas dataset lama."""
+        entri = self._store._ambil(df_baru.columns[0], df_baru.iloc[:, 0].to_numpy(dtype=object), list(df_baru.columns[1:]), _ke_array(df_baru.iloc[:, 1:]))
+        self._finalizer()
+        self._pasang(entri, df_baru.index)
+
+    @property
+    def kolom(self):
+        return self.entri.kolom
+
+    def __len__(self):
+        return len(self.entri.label) - len(self.hapus) + len(self.tambahan)
+
+    def ada_ubahan(self):
+        return bool(self.ubahan or self.hapus or self.tambahan)
+
+    def kunci_basis(self):
+        return pd.RangeIndex(len(self.entri.label)) if self._kunci_basis is None else self._kunci_basis
+
+    def _posisi_tetap(self):
+        return np.setdiff1d(np.arange(len(self.entri.label)), np.fromiter(self.hapus, dtype=np.int64, count=len(self.hapus)))
+
+    def kunci(self):
+        if not self.ada_ubahan():
+            return self.kunci_basis()
+        return self.kunci_basis()[self._posisi_tetap()].append(pd.Index([k for k, _, _ in self.tambahan]))
+
+    def frame_basis(self):
+        return self.entri.frame()
+
+    def frame(self):
+        """Data efektif sesi, berindeks nama alternatif. Tanpa overlay, tidak ada salinan yang dibuat."""
+        if not self.ada_ubahan():
+            return self.entri.frame()
+        tetap = self._posisi_tetap()
+        # Overlay selalu float64, jadi basis float32 dinaikkan dulu agar editan tidak terpotong
+        nilai = self.entri.nilai[tetap].astype(np.float64, copy=False)
+        label = self.entri.label.to_numpy()[tetap]
+        for posisi, (nama, baris) in self.ubahan.items():
+            i = np.searchsorted(tetap, posisi)
+            nilai[i] = baris
+            label[i] = nama
+        if self.tambahan:
+            nilai = np.vstack([nilai] + [baris[None, :] for _, _, baris in self.tambahan])
+            label = np.concatenate([label, np.array([nama for _, nama, _ in self.tambahan], dtype=object)])
+        return pd.DataFrame(nilai, index=pd.Index(label, name=self.entri.label.name, dtype=object), columns=self.entri.kolom)
+
+    def frame_editor(self):
+        """Salinan float64 untuk st.data_editor (editan desimal tidak dipotong ke float32), index = kunci baris."""
+        df = self.frame().astype(np.float64).reset_index()
+        df.index = self.kunci()
+        return df
+
+    def terapkan(self, df_baru):
+        """Samakan handle dengan hasil editor. Mengembalikan 'tetap' (tanpa overlay), 'overlay', atau 'pisah'."""
+        entri = self.entri
+        n = len(entri.label)
+        if df_baru.columns[0] != entri.label.name or list(df_baru.columns[1:]) != entri.kolom:
+            self._pisah(df_baru)
+            return 'pisah'
+
+        kunci_basis = self.kunci_basis()
+        if not df_baru.index.is_unique or not kunci_basis.is_unique:
+            self._pisah(df_baru)
+            return 'pisah'
+        posisi = kunci_basis.get_indexer(df_baru.index)
+        m = int((posisi >= 0).sum())
+        # Sama seperti editor: baris lama tetap berurutan, baris baru hanya di akhir
+        if not (posisi[:m] >= 0).all() or (np.diff(posisi[:m]) <= 0).any():
+            self._pisah(df_baru)
+            return 'pisah'
+
+        # Overlay disimpan float64 berapa pun dtype dataset bersama; basis float32 naik ke float64 tanpa galat
+        nilai_baru = _ke_array(df_baru.iloc[:, 1:], np.float64)
+        label_baru = df_baru.iloc[:, 0].to_numpy(dtype=object)
+        pos = posisi[:m]
+        lama = entri.nilai[pos]
+        sama_nilai = ((nilai_baru[:m] == lama) | (np.isnan(nilai_baru[:m]) & np.isnan(lama))).all(axis=1)
+        berubah = np.flatnonzero(~sama_nilai | (label_baru[:m] != entri.label.to_numpy()[pos]))
+
+        hapus = set(np.setdiff1d(np.arange(n), pos).tolist())
+        jumlah = len(berubah) + len(hapus) + (len(df_baru) - m)
+        if jumlah > MAKS_FRAKSI_OVERLAY * max(n, 1):
+            self._pisah(df_baru)
+            return 'pisah'
+
+        ubahan = {int(pos[i]): (label_baru[i], nilai_baru[i].copy()) for i in berubah}
+        tambahan = [(df_baru.index[i], label_baru[i], nilai_baru[i].copy()) for i in range(m, len(df_baru))]
+        self.ubahan, self.hapus, self.tambahan = ubahan, hapus, tambahan
+        return 'overlay' if self.ada_ubahan() else 'tetap'
+
+    def pesan_state(self, nbytes):
+        """Pesan anggaran untuk state per sesi sebesar nbytes (menggantikan pesanan sebelumnya).
+
+        Mengembalikan False jika anggaran store tidak cukup; pemanggil sebaiknya tidak menyimpan state tersebut."""
+        if nbytes == self.bytes_state and self._pelepas_state is not None:
+            return True
+        self.lepas_state()
+        if not self._store.pesan(nbytes):
+            return False
+        self.bytes_state = nbytes
+        self._pelepas_state = weakref.finalize(self, self._store.kembalikan, nbytes)
+        return True
+
+    def lepas_state(self):
+        if self._pelepas_state is not None:
+            self._pelepas_state()
+            self._pelepas_state = None
+            self.bytes_state = 0
+
+    def ukuran_overlay(self):
+        """Perkiraan byte overlay milik sesi ini (di luar dataset bersama)."""
+        return sum(b.nbytes for _, b in self.ubahan.values()) + sum(b.nbytes for _, _, b in self.tambahan) + 8 * len(self.hapus)
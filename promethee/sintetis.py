@@ -0,0 +1,41 @@
+"""Generator dataset IUP sintetis (seeded) untuk benchmark dan uji skala."""
+import numpy as np
+import pandas as pd
+
+from .config import KRITERIA_CONFIG
+
+
+def buat_config(k, seed=0):
+    """KRITERIA_CONFIG untuk k kriteria: 14 kriteria asli, sisanya kriteria sintetis C15..Ck."""
+    if k <= len(KRITERIA_CONFIG):
+        return {kode: dict(v) for kode, v in list(KRITERIA_CONFIG.items())[:k]}
+    rng = np.random.default_rng(seed)
+    config = {kode: dict(v) for kode, v in KRITERIA_CONFIG.items()}
+    for i in range(len(KRITERIA_CONFIG) + 1, k + 1):
+        q, p = (5, 20) if rng.random() < 0.5 else (2, 10)
+        config[f'C{i}'] = {
+            'nama': f'Kriteria {i}', 'tipe': 'min' if rng.random() < 0.2 else 'max',
+            'bobot': float(rng.uniform(0.005, 0.05)), 'q': q, 'p': p,
+        }
+    # Normalisasi agar total bobot tetap 1 seperti konfigurasi asli
+    total = sum(v['bobot'] for v in config.values())
+    for v in config.values():
+        v['bobot'] /= total
+    return config
+
+
+def buat_dataset(n, k=14, seed=0):
+    """DataFrame 'Nama IUP' + k kolom skor bulat 0-99 dan konfigurasinya.
+
+    Skor dibangkitkan dari kualitas laten tiap IUP ditambah noise per kriteria, sehingga kriteria
+    saling berkorelasi dan sebaran tingkat rubrik (Rendah/Sedang/Tinggi) menyerupai data nyata."""
+    rng = np.random.default_rng(seed)
+    config = buat_config(k, seed)
+    laten = rng.normal(60, 12, size=(n, 1))
+    kecenderungan = rng.normal(0, 8, size=(1, k))
+    skor = laten + kecenderungan + rng.normal(0, 15, size=(n, k))
+    skor = np.clip(np.rint(skor), 0, 99)
+
+    df = pd.DataFrame(skor, columns=list(config))
+    df.insert(0, 'Nama IUP', [f'IUP {i + 1:05d}' for i in range(n)])
+    return df, config
@@ -0,0 +1,259 @@
+"""Penyimpanan skenario what-if di SQLite: dataset, konfigurasi kriteria, dan flow unikriteria per hash isi.
+
+Dataset, konfigurasi, dan flow disimpan sekali per hash isi sehingga skenario yang berbagi data tidak
+menggandakan isi. Flow unikriteria (jumlah preferensi keluar/masuk, n x k) ikut disimpan, jadi membuka
+skenario dan membandingkan dua skenario tidak perlu menghitung ulang PROMETHEE."""
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import hash_frame
+from .engine import flow_unikriteria, siapkan_matriks, susun_hasil
+from .sensitivitas import hash_matriks
+
+ENV_DB = 'SPK_STORE'
+DB_DEFAULT = 'data/skenario.sqlite'
+# Porsi minimum |efek| agar skor/bobot ikut disebut sebagai penyebab pergeseran
+PORSI_PENYEBAB = 0.1
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS dataset (
+    hash TEXT PRIMARY KEY, n INTEGER NOT NULL, kolom TEXT NOT NULL, nama_index TEXT,
+    label TEXT NOT NULL, nilai BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS config (hash TEXT PRIMARY KEY, isi TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS flow (
+    hash TEXT PRIMARY KEY, n INTEGER NOT NULL, kolom TEXT NOT NULL, leaving BLOB NOT NULL, entering BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS skenario (
+    nama TEXT PRIMARY KEY,
+    dataset TEXT NOT NULL REFERENCES dataset(hash),
+    config TEXT NOT NULL REFERENCES config(hash),
+    flow TEXT NOT NULL REFERENCES flow(hash),
+    catatan TEXT NOT NULL DEFAULT '',
+    dibuat REAL NOT NULL,
+    diubah REAL NOT NULL
+);
+"""
+
+
+class Skenario(NamedTuple):
+    nama: str
+    df: pd.DataFrame        # skor per alternatif (index = nama alternatif)
+    config: dict
+    kolom: list             # kriteria yang dipakai dalam perhitungan flow
+    bobot: np.ndarray       # bobot ternormalisasi per kolom
+    leaving: np.ndarray     # n x k, jumlah preferensi keluar per kriteria
+    entering: np.ndarray    # n x k, jumlah preferensi masuk per kriteria
+    catatan: str
+    diubah: float
+
+
+class HasilDiff(NamedTuple):
+    tabel: pd.DataFrame             # per alternatif yang ada di kedua skenario
+    bobot: pd.DataFrame             # bobot per kriteria di A dan B
+    alternatif_baru: list
+    alternatif_hilang: list
+
+
+def _hash_config(kriteria_config):
+    return hashlib.blake2b(json.dumps(kriteria_config, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+def _ke_blob(arr):
+    return zlib.compress(np.ascontiguousarray(arr, dtype=np.float64).tobytes(), 1)
+
+
+def _dari_blob(blob, n, k):
+    return np.frombuffer(zlib.decompress(blob), dtype=np.float64).reshape(n, k)
+
+
+class SkenarioStore:
+    """Satu file SQLite per instalasi. Koneksi dibuka per operasi agar aman dipakai dari banyak sesi/thread."""
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.environ.get(ENV_DB, DB_DEFAULT))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._koneksi() as kon:
+            kon.execute('PRAGMA journal_mode=WAL')
+            kon.executescript(SKEMA)
+
+    @contextlib.contextmanager
+    def _koneksi(self):
+        kon = sqlite3.connect(self.path, timeout=30)
+        try:
+            with kon:
+                yield kon
+        finally:
+            kon.close()
+
+    def simpan(self, nama, df, kriteria_config, catatan='', flow=None):
+        """Simpan (atau timpa) skenario bernama. df berindeks nama alternatif dengan kolom skor kriteria.
+
+        flow: (leaving, entering) untuk df ini jika sudah tersedia; jika tidak, dihitung hanya ketika
+        kombinasi dataset + q/p belum pernah tersimpan."""
+        nama = nama.strip()
+        if not nama:
+            raise ValueError("Nama skenario tidak boleh kosong")
+        nilai = df.apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        df = pd.DataFrame(nilai, index=pd.Index(df.index.astype(str), name=df.index.name), columns=[str(c) for c in df.columns])
+        mk = siapkan_matriks(df, kriteria_config)
+        h_dataset = hash_frame(df)
+        h_config = _hash_config(kriteria_config)
+        h_flow = hash_matriks(mk)
+        sekarang = time.time()
+
+        with self._koneksi() as kon:
+            kon.execute(
+                'INSERT OR IGNORE INTO dataset VALUES (?, ?, ?, ?, ?, ?)',
+                (h_dataset, len(df), json.dumps(list(df.columns)), df.index.name, json.dumps(list(df.index)), _ke_blob(nilai)),
+            )
+            # Urutan kriteria dipertahankan (urutan kolom flow); sort_keys hanya untuk hash
+            kon.execute('INSERT OR IGNORE INTO config VALUES (?, ?)', (h_config, json.dumps(kriteria_config, default=str)))
+            if kon.execute('SELECT 1 FROM flow WHERE hash = ?', (h_flow,)).fetchone() is None:
+                leaving, entering = flow_unikriteria(mk) if flow is None else flow
+                kon.execute(
+                    'INSERT INTO flow VALUES (?, ?, ?, ?, ?)',
+                    (h_flow, len(df), json.dumps(mk.kolom), _ke_blob(leaving), _ke_blob(entering)),
+                )
+            kon.execute(
+                """INSERT INTO skenario VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(nama) DO UPDATE SET dataset = excluded.dataset, config = excluded.config,
+                   flow = excluded.flow, catatan = excluded.catatan, diubah = excluded.diubah""",
+                (nama, h_dataset, h_config, h_flow, catatan, sekarang, sekarang),
+            )
+        return nama
+
+    def daftar(self):
+        with self._koneksi() as kon:
+            baris = kon.execute(
+                """SELECT s.nama, d.n, f.kolom, s.catatan, s.diubah FROM skenario s
+                   JOIN dataset d ON d.hash = s.dataset JOIN flow f ON f.hash = s.flow ORDER BY s.diubah DESC"""
+            ).fetchall()
+        return pd.DataFrame(
+            [(nama, n, len(json.loads(kolom)), catatan, pd.Timestamp(diubah, unit='s')) for nama, n, kolom, catatan, diubah in baris],
+            columns=['Nama', 'Alternatif', 'Kriteria', 'Catatan', 'Diubah'],
+        )
+
+    def muat(self, nama):
+        with self._koneksi() as kon:
+            baris = kon.execute(
+                """SELECT d.n, d.kolom, d.nama_index, d.label, d.nilai, c.isi, f.kolom, f.leaving, f.entering,
+                          s.catatan, s.diubah
+                   FROM skenario s JOIN dataset d ON d.hash = s.dataset JOIN config c ON c.hash = s.config
+                   JOIN flow f ON f.hash = s.flow WHERE s.nama = ?""",
+                (nama,),
+            ).fetchone()
+        if baris is None:
+            raise KeyError(f"Skenario tidak ditemukan: {nama}")
+        n, kolom_df, nama_index, label, nilai, isi_config, kolom_flow, leaving, entering, catatan, diubah = baris
+        kolom_df, kolom_flow, config = json.loads(kolom_df), json.loads(kolom_flow), json.loads(isi_config)
+        df = pd.DataFrame(_dari_blob(nilai, n, len(kolom_df)), index=pd.Index(json.loads(label), name=nama_index), columns=kolom_df)
+        total_bobot = sum(v['bobot'] for v in config.values())
+        bobot = np.array([config[k]['bobot'] for k in kolom_flow], dtype=float)
+        bobot = bobot / total_bobot if total_bobot > 0 else np.zeros(len(kolom_flow))
+        return Skenario(
+            nama, df, config, kolom_flow, bobot,
+            _dari_blob(leaving, n, len(kolom_flow)), _dari_blob(entering, n, len(kolom_flow)), catatan, diubah,
+        )
+
+    def hapus(self, nama):
+        """Hapus skenario beserta dataset/config/flow yang tidak lagi dirujuk skenario lain."""
+        with self._koneksi() as kon:
+            kon.execute('DELETE FROM skenario WHERE nama = ?', (nama,))
+            for tabel in ('dataset', 'config', 'flow'):
+                kon.execute(f'DELETE FROM {tabel} WHERE hash NOT IN (SELECT {tabel} FROM skenario)')
+
+
+def flow_net(sk):
+    """Net flow unikriteria ternormalisasi (n x k) dari flow tersimpan."""
+    n = len(sk.df)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (sk.leaving - sk.entering) / (n - 1)
+
+
+def hasil_skenario(sk):
+    """Tabel hasil PROMETHEE II skenario langsung dari flow tersimpan."""
+    n = len(sk.df)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return susun_hasil(sk.df.index, (sk.leaving @ sk.bobot) / (n - 1), (sk.entering @ sk.bobot) / (n - 1))
+
+
+def _peringkat(phi):
+    urutan = np.argsort(-phi, kind='stable')
+    peringkat = np.empty(len(phi), dtype=np.int64)
+    peringkat[urutan] = np.arange(1, len(phi) + 1)
+    return peringkat
+
+
+def _selaraskan(sk, kolom):
+    """Net flow unikriteria dan bobot skenario pada daftar kolom gabungan (kriteria absen = 0)."""
+    posisi = [sk.kolom.index(k) if k in sk.kolom else -1 for k in kolom]
+    ada = np.array(posisi) >= 0
+    F = np.zeros((len(sk.df), len(kolom)))
+    w = np.zeros(len(kolom))
+    F[:, ada] = flow_net(sk)[:, [p for p in posisi if p >= 0]]
+    w[ada] = sk.bobot[[p for p in posisi if p >= 0]]
+    return F, w
+
+
+def diff_skenario(a, b):
+    """Pergeseran peringkat dari skenario a ke b beserta atribusinya ke perubahan skor vs bobot.
+
+    phi = F . w, sehingga selisih net flow tiap alternatif terurai tepat menjadi
+        (F_b - F_a) . w_a   -> efek skor (termasuk q/p dan alternatif yang ditambah/dihapus)
+      + F_b . (w_b - w_a)   -> efek bobot
+    Kriteria dengan kontribusi terbesar searah pergeseran dilaporkan sebagai pemicu utama. Atribusi
+    ini pada level net flow; peringkat ikut bergeser karena net flow alternatif lain juga berubah."""
+    kolom = list(a.kolom) + [k for k in b.kolom if k not in a.kolom]
+    F_a, w_a = _selaraskan(a, kolom)
+    F_b, w_b = _selaraskan(b, kolom)
+    phi_a, phi_b = F_a @ w_a, F_b @ w_b
+    rank_a, rank_b = _peringkat(phi_a), _peringkat(phi_b)
+
+    label_a = pd.Index(a.df.index)
+    label_b = pd.Index(b.df.index)
+    sama = label_a.intersection(label_b, sort=False)
+    ia, ib = label_a.get_indexer(sama), label_b.get_indexer(sama)
+
+    F_a, F_b = F_a[ia], F_b[ib]
+    kontribusi_skor = (F_b - F_a) * w_a
+    kontribusi_bobot = F_b * (w_b - w_a)
+    efek_skor = kontribusi_skor.sum(axis=1)
+    efek_bobot = kontribusi_bobot.sum(axis=1)
+    delta = phi_b[ib] - phi_a[ia]
+
+    arah = np.sign(delta)[:, None]
+    kontribusi = (kontribusi_skor + kontribusi_bobot) * arah
+    pemicu = np.array(kolom, dtype=object)[kontribusi.argmax(axis=1)] if kolom else np.full(len(sama), None)
+
+    total_efek = np.abs(efek_skor) + np.abs(efek_bobot)
+    ada_skor = np.abs(efek_skor) > PORSI_PENYEBAB * total_efek
+    ada_bobot = np.abs(efek_bobot) > PORSI_PENYEBAB * total_efek
+    penyebab = np.select(
+        [total_efek == 0, ada_skor & ada_bobot, ada_skor], ['Tetap', 'Skor & Bobot', 'Skor'], default='Bobot',
+    )
+    pemicu = np.where(total_efek == 0, None, pemicu)
+
+    kolom_skor = [k for k in a.df.columns if k in b.df.columns]
+    skor_berubah = (a.df.loc[sama, kolom_skor].to_numpy() != b.df.loc[sama, kolom_skor].to_numpy()).sum(axis=1)
+
+    tabel = pd.DataFrame({
+        'Peringkat A': rank_a[ia], 'Peringkat B': rank_b[ib], 'Pergeseran': rank_a[ia] - rank_b[ib],
+        'Net Flow A': phi_a[ia], 'Net Flow B': phi_b[ib], 'Selisih Net Flow': delta,
+        'Efek Skor': efek_skor, 'Efek Bobot': efek_bobot, 'Penyebab': penyebab, 'Pemicu Utama': pemicu,
+        'Skor Berubah': skor_berubah,
+    }, index=sama)
+    tabel = tabel.iloc[np.lexsort((tabel['Peringkat B'].to_numpy(), -np.abs(tabel['Pergeseran'].to_numpy())))]
+
+    bobot = pd.DataFrame({'Kode': kolom, 'Bobot A': w_a, 'Bobot B': w_b, 'Selisih': w_b - w_a})
+    return HasilDiff(tabel, bobot, list(label_b.difference(label_a, sort=False)), list(label_a.difference(label_b, sort=False)))
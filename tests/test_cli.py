@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+
+from promethee.cli import main, nama_output
+from promethee.config import KRITERIA_CONFIG
+from promethee.sintetis import buat_dataset
+
+
+def test_nama_output_unik():
+    files = [Path(p) for p in ('d1/a.xlsx', 'd1/a.csv', 'd2/a.csv', 'd1/b.csv', 'x/y/c.csv', 'z/y/c.csv')]
+    nama = nama_output(files)
+    assert nama[:4] == ['a_xlsx', 'd1_a_csv', 'd2_a_csv', 'b']
+    assert len({n.lower() for n in nama}) == len(files)
+
+
+def test_rank_batch_tidak_saling_menimpa(tmp_path):
+    for i, sub in enumerate(('d1', 'd2')):
+        (tmp_path / sub).mkdir()
+        df, _ = buat_dataset(20 + i, len(KRITERIA_CONFIG), seed=i)
+        df.to_csv(tmp_path / sub / 'a.csv', index=False)
+    df.to_excel(tmp_path / 'd1' / 'a.xlsx', index=False)
+    out = tmp_path / 'hasil'
+    assert main(['rank', str(tmp_path / 'd1'), str(tmp_path / 'd2'), '--out', str(out), '--workers', '1']) == 0
+    ringkasan = json.loads((out / 'ringkasan.json').read_text(encoding='utf-8'))
+    assert len({r['output'] for r in ringkasan}) == 3
+    for r in ringkasan:
+        assert sum(1 for _ in open(out / f"{r['output']}_ranking.csv", encoding='utf-8')) == r['alternatif'] + 1
+
+
+def test_galat_tak_terduga_tidak_menghentikan_batch(tmp_path, monkeypatch):
+    import promethee.engine
+
+    asli = promethee.engine.hitung_promethee
+
+    def rusak_untuk_b(df, *args, **kwargs):
+        if len(df) == 21:
+            raise RuntimeError('meledak')
+        return asli(df, *args, **kwargs)
+
+    monkeypatch.setattr(promethee.engine, 'hitung_promethee', rusak_untuk_b)
+    for i, nama in enumerate(('a', 'b', 'c')):
+        df, _ = buat_dataset(20 + i, len(KRITERIA_CONFIG), seed=i)
+        df.to_csv(tmp_path / f'{nama}.csv', index=False)
+    out = tmp_path / 'hasil'
+    assert main(['rank', str(tmp_path), '--out', str(out), '--workers', '1']) == 1
+    status = {Path(r['file']).name: r for r in json.loads((out / 'ringkasan.json').read_text(encoding='utf-8'))}
+    assert status['a.csv']['status'] == status['c.csv']['status'] == 'ok'
+    assert status['b.csv']['status'] == 'gagal' and status['b.csv']['pesan'] == 'RuntimeError: meledak'
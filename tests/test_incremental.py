@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from promethee import incremental
+from promethee.engine import AMBANG_N_BESAR, hitung_promethee
+from promethee.incremental import FlowInkremental
+from promethee.sintetis import buat_dataset
+
+TOLERANSI = 1e-9
+
+
+@pytest.fixture
+def data():
+    df, config = buat_dataset(40, 14, seed=3)
+    return df.set_index('Nama IUP'), config
+
+
+def cocok_dengan_ulang_penuh(flow, df, config):
+    acuan = hitung_promethee(df, config, metode='pairwise')
+    hasil = flow.hasil().reindex(acuan.index)
+    np.testing.assert_allclose(hasil.to_numpy(), acuan.to_numpy(), rtol=0, atol=TOLERANSI)
+    assert flow.periksa_konsistensi() < TOLERANSI
+
+
+def test_tanpa_perubahan(data):
+    df, config = data
+    flow = FlowInkremental(df, config)
+    assert flow.sinkronkan(df.copy()) == 'tetap'
+    cocok_dengan_ulang_penuh(flow, df, config)
+
+
+def test_edit_baris(data):
+    df, config = data
+    flow = FlowInkremental(df, config)
+    edit = df.copy()
+    edit.iloc[7, [0, 5, 13]] = [0.0, 99.0, 50.0]
+    assert flow.sinkronkan(edit) == 'inkremental'
+    cocok_dengan_ulang_penuh(flow, edit, config)
+
+
+def test_tambah_baris(data):
+    df, config = data
+    flow = FlowInkremental(df, config)
+    baru = pd.DataFrame([np.full(len(df.columns), 75.0)], columns=df.columns, index=pd.Index(['IUP Baru'], name=df.index.name))
+    tambah = pd.concat([df, baru])
+    assert flow.sinkronkan(tambah) == 'inkremental'
+    cocok_dengan_ulang_penuh(flow, tambah, config)
+    assert flow.label[-1] == 'IUP Baru'
+
+
+def test_hapus_baris(data):
+    df, config = data
+    flow = FlowInkremental(df, config)
+    hapus = df.drop(df.index[[0, 20]])
+    assert flow.sinkronkan(hapus) == 'inkremental'
+    cocok_dengan_ulang_penuh(flow, hapus, config)
+
+
+def test_edit_hapus_tambah_sekaligus_dengan_kunci_editor(data):
+    df, config = data
+    kunci = list(range(len(df)))
+    flow = FlowInkremental(df, config, kunci)
+    edit = df.copy()
+    edit.iloc[3] = edit.iloc[3] + 10
+    edit = edit.drop(edit.index[11])
+    kunci_edit = [k for k in kunci if k != 11]
+    baru = pd.DataFrame([df.iloc[0].to_numpy() - 5], columns=df.columns, index=pd.Index(['IUP Baru'], name=df.index.name))
+    edit = pd.concat([edit, baru])
+    kunci_edit.append(len(df))
+    assert flow.sinkronkan(edit, kunci_edit) == 'inkremental'
+    cocok_dengan_ulang_penuh(flow, edit, config)
+    assert flow.kunci == kunci_edit
+
+
+def test_ganti_nama_tanpa_ubah_skor(data):
+    df, config = data
+    kunci = list(range(len(df)))
+    flow = FlowInkremental(df, config, kunci)
+    ganti = df.rename(index={df.index[4]: 'IUP Ganti Nama'})
+    assert flow.sinkronkan(ganti, kunci) == 'tetap'
+    cocok_dengan_ulang_penuh(flow, ganti, config)
+
+
+def test_urutan_berubah_dihitung_ulang(data):
+    df, config = data
+    flow = FlowInkremental(df, config)
+    acak = df.iloc[np.random.default_rng(0).permutation(len(df))]
+    assert flow.sinkronkan(acak) == 'ulang'
+    cocok_dengan_ulang_penuh(flow, acak, config)
+
+
+def test_baris_baru_di_tengah_dihitung_ulang(data):
+    df, config = data
+    flow = FlowInkremental(df, config)
+    baru = pd.DataFrame([np.full(len(df.columns), 40.0)], columns=df.columns, index=pd.Index(['IUP Baru'], name=df.index.name))
+    sisip = pd.concat([df.iloc[:10], baru, df.iloc[10:]])
+    assert flow.sinkronkan(sisip) == 'ulang'
+    cocok_dengan_ulang_penuh(flow, sisip, config)
+
+
+def test_kunci_ganda_dihitung_ulang(data):
+    df, config = data
+    flow = FlowInkremental(df, config)
+    edit = df.copy()
+    edit.iloc[2] = edit.iloc[2] + 1
+    assert flow.sinkronkan(edit, [0] * len(edit)) == 'ulang'
+    cocok_dengan_ulang_penuh(flow, edit, config)
+
+
+def test_banyak_edit_dihitung_ulang(data):
+    df, config = data
+    flow = FlowInkremental(df, config)
+    edit = df.copy()
+    edit.iloc[:len(df) // 8 + 1] = edit.iloc[:len(df) // 8 + 1] + 3
+    assert flow.sinkronkan(edit) == 'ulang'
+    cocok_dengan_ulang_penuh(flow, edit, config)
+
+
+def test_ganti_parameter_dihitung_ulang(data):
+    df, config = data
+    flow = FlowInkremental(df, config)
+    config_baru = {k: dict(v) for k, v in config.items()}
+    config_baru['C1']['q'], config_baru['C1']['p'] = 0, 40
+    assert flow.sinkronkan(df, kriteria_config=config_baru) == 'ulang'
+    cocok_dengan_ulang_penuh(flow, df, config_baru)
+
+
+def test_ganti_bobot_tanpa_hitung_ulang(data):
+    df, config = data
+    flow = FlowInkremental(df, config)
+    config_baru = {k: dict(v) for k, v in config.items()}
+    config_baru['C2']['bobot'] *= 3
+    assert flow.sinkronkan(df, kriteria_config=config_baru) == 'tetap'
+    cocok_dengan_ulang_penuh(flow, df, config_baru)
+
+
+def test_batas_operasi_delta(data, monkeypatch):
+    df, config = data
+    monkeypatch.setattr(incremental, 'MAKS_OPERASI_DELTA', 2)
+    flow = FlowInkremental(df, config)
+    edit = df.copy()
+    status = []
+    for i in range(3):
+        edit.iloc[i] = edit.iloc[i] + 1
+        status.append(flow.sinkronkan(edit.copy()))
+    assert status == ['inkremental', 'inkremental', 'ulang']
+    assert flow.operasi_delta == 0
+    cocok_dengan_ulang_penuh(flow, edit, config)
+
+
+def test_rangkaian_edit_jalur_terurut():
+    df, config = buat_dataset(AMBANG_N_BESAR + 100, 14, seed=5)
+    df = df.set_index('Nama IUP')
+    flow = FlowInkremental(df, config)
+    rng = np.random.default_rng(1)
+    for _ in range(5):
+        i = int(rng.integers(len(df)))
+        df = df.copy()
+        df.iloc[i] = np.clip(df.iloc[i] + rng.integers(-20, 21, len(df.columns)), 0, 99)
+        assert flow.sinkronkan(df) == 'inkremental'
+    df = df.drop(df.index[100])
+    assert flow.sinkronkan(df) == 'inkremental'
+    cocok_dengan_ulang_penuh(flow, df, config)
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from promethee.config import KRITERIA_CONFIG
+from promethee.ingest import FileTidakValid, baca_upload
+
+
+def csv_bytes(skor, nama=None):
+    df = pd.DataFrame(skor, columns=list(KRITERIA_CONFIG))
+    df.insert(0, 'Nama IUP', nama if nama is not None else [f'IUP {i}' for i in range(len(df))])
+    return df.to_csv(index=False).encode()
+
+
+def test_skor_bulat_dipadatkan_float32():
+    skor = np.random.default_rng(0).integers(0, 100, (20, len(KRITERIA_CONFIG))).astype(float)
+    hasil = baca_upload('bulat.csv', csv_bytes(skor), KRITERIA_CONFIG)
+    assert (hasil.df.dtypes.iloc[1:] == np.float32).all()
+    np.testing.assert_array_equal(hasil.nilai, skor)
+
+
+def test_skor_desimal_tidak_kehilangan_presisi():
+    skor = np.round(np.random.default_rng(1).uniform(0, 100, (20, len(KRITERIA_CONFIG))), 2)
+    hasil = baca_upload('desimal.csv', csv_bytes(skor), KRITERIA_CONFIG)
+    np.testing.assert_array_equal(hasil.nilai, skor)
+    np.testing.assert_array_equal(hasil.df.iloc[:, 1:].to_numpy(dtype=float), skor)
+
+
+def test_laporan_validasi_per_baris():
+    skor = np.full((3, len(KRITERIA_CONFIG)), 50.0).astype(object)
+    skor[0, 0] = 'abc'
+    skor[2, 1] = 150
+    hasil = baca_upload('laporan.csv', csv_bytes(skor, ['A', 'A', 'B']), KRITERIA_CONFIG)
+    pesan = set(zip(hasil.laporan['Baris'], hasil.laporan['Pesan']))
+    assert {(2, 'Bukan angka, diisi 0'), (2, 'Nama duplikat'), (3, 'Nama duplikat'), (4, 'Di luar rentang 0-100')} <= pesan
+    assert hasil.nilai[0, 0] == 0.0
+
+
+def test_kolom_hilang():
+    df = pd.DataFrame({'Nama IUP': ['A'], 'C1': [1]})
+    with pytest.raises(FileTidakValid, match='Kolom hilang'):
+        baca_upload('kurang.csv', df.to_csv(index=False).encode(), KRITERIA_CONFIG)
@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+from promethee.jobs import BATAL, SELESAI, JobRunner
+
+
+def bertahap(langkah, jeda=0.05, mulai=None):
+    if mulai is not None:
+        mulai.set()
+    for i in range(langkah):
+        time.sleep(jeda)
+        yield (i + 1) / langkah, i
+
+
+def tunggu(job, batas=10.0):
+    akhir = time.time() + batas
+    while job.aktif() and time.time() < akhir:
+        time.sleep(0.01)
+    assert not job.aktif()
+
+
+@pytest.fixture
+def runner():
+    r = JobRunner(maks_worker=2)
+    yield r
+    r.tutup()
+
+
+def test_kiriman_identik_dibagi(runner):
+    j1 = runner.kirim('k', bertahap, 3, peminat='a')
+    j2 = runner.kirim('k', bertahap, 3, peminat='b')
+    assert j1 is j2
+    tunggu(j1)
+    assert j1.status == SELESAI and j1.hasil == 2 and j1.progres == 1.0
+
+
+def test_kirim_ulang_sesi_sama_tidak_menghalangi_batal(runner):
+    job = runner.kirim('k', bertahap, 100, peminat='a')
+    assert runner.kirim('k', bertahap, 100, peminat='a') is job
+    assert runner.lepas(job, 'a')
+    tunggu(job)
+    assert job.status == BATAL
+
+
+def test_batal_hanya_jika_tidak_ada_peminat_lain(runner):
+    job = runner.kirim('k', bertahap, 100, peminat='a')
+    runner.kirim('k', bertahap, 100, peminat='b')
+    assert not runner.lepas(job, 'a')
+    assert job.aktif()
+    assert runner.lepas(job, 'b')
+    tunggu(job)
+
+
+def test_kirim_ulang_setelah_batal_membuat_job_baru(runner):
+    mulai = threading.Event()
+    job = runner.kirim('k', bertahap, 100, 0.2, mulai, peminat='a')
+    mulai.wait(5)
+    assert runner.lepas(job, 'a')
+    # Job lama masih menuntaskan langkahnya, tetapi tidak boleh dikembalikan lagi
+    baru = runner.kirim('k', bertahap, 2, peminat='a')
+    assert baru is not job
+    assert runner.ambil('k') is baru
+    tunggu(job)
+    tunggu(baru)
+    assert job.status == BATAL and baru.status == SELESAI
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from benchmarks.bench_preferensi import PARAMETER_UJI, acuan_skalar, config_campuran, flow_skalar
+from promethee.engine import flow_kriteria, hitung_promethee, siapkan_matriks
+from promethee.incremental import FlowInkremental
+from promethee.preferensi import REGISTRI, ambil_fungsi, daftarkan_fungsi, preferensi, preferensi_kolom
+from promethee.sintetis import buat_dataset
+
+TOLERANSI = 1e-9
+
+
+def test_parameter_uji_mencakup_semua_fungsi():
+    assert set(PARAMETER_UJI) == set(REGISTRI)
+
+
+@pytest.mark.parametrize('nama', list(PARAMETER_UJI))
+def test_kernel_sama_dengan_acuan_skalar(nama):
+    q, p, s = PARAMETER_UJI[nama]
+    batas = [0.0, q, p, -q, -p, np.nextafter(q, np.inf), np.nextafter(p, np.inf), np.nextafter(0.0, 1.0)]
+    d = np.concatenate([batas, np.random.default_rng(0).uniform(-40, 40, 2_000), np.arange(-40.0, 41.0)])
+    acuan = np.array([acuan_skalar(nama, v, q, p, s) for v in d])
+    np.testing.assert_allclose(preferensi(d, nama, q, p, s), acuan, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('nama', list(PARAMETER_UJI))
+def test_nilai_di_titik_batas(nama):
+    q, p, s = PARAMETER_UJI[nama]
+    # d = 0 tidak pernah memberi preferensi; d = q masih indiferen, d = p sudah preferensi (penuh/setengah)
+    assert preferensi(np.array([0.0]), nama, q, p, s)[0] == 0.0
+    if nama in ('u-shape', 'level', 'linear'):
+        assert preferensi(np.array([q]), nama, q, p, s)[0] == 0.0
+    if nama in ('v-shape', 'linear'):
+        assert preferensi(np.array([p]), nama, q, p, s)[0] == 1.0
+    if nama == 'level':
+        assert preferensi(np.array([p]), nama, q, p, s)[0] == 0.5
+
+
+@pytest.mark.parametrize('nama', list(PARAMETER_UJI))
+@pytest.mark.parametrize('metode', ['pairwise', 'terurut'])
+def test_flow_satu_kriteria_sama_dengan_loop_skalar(nama, metode):
+    q, p, s = PARAMETER_UJI[nama]
+    # Skor bulat: banyak selisih jatuh tepat di 0, q, dan p
+    x = np.random.default_rng(1).integers(0, 60, 80).astype(float)
+    leaving, entering = flow_kriteria(x, nama, q, p, s, metode)
+    l_acuan, e_acuan = flow_skalar(x.tolist(), nama, q, p, s)
+    np.testing.assert_allclose(leaving, l_acuan, rtol=0, atol=TOLERANSI)
+    np.testing.assert_allclose(entering, e_acuan, rtol=0, atol=TOLERANSI)
+
+
+@pytest.fixture
+def campuran():
+    df, _ = buat_dataset(60, 14, seed=2)
+    return df.set_index('Nama IUP'), config_campuran(14, seed=2)
+
+
+def net_flow_skalar(df, config):
+    mk = siapkan_matriks(df, config)
+    n = len(df)
+    phi = np.zeros(n)
+    for j in range(len(mk.kolom)):
+        leaving, entering = flow_skalar(mk.nilai[:, j].tolist(), mk.fungsi[j], mk.q[j], mk.p[j], mk.s[j])
+        phi += (leaving - entering) * mk.bobot[j] / (n - 1)
+    return phi
+
+
+@pytest.mark.parametrize('metode', ['pairwise', 'terurut'])
+def test_engine_fungsi_campuran(campuran, metode):
+    df, config = campuran
+    assert len({v['fungsi'] for v in config.values()}) == len(PARAMETER_UJI)
+    phi = hitung_promethee(df, config, metode=metode)['Net Flow'].reindex(df.index).to_numpy()
+    np.testing.assert_allclose(phi, net_flow_skalar(df, config), rtol=0, atol=TOLERANSI)
+
+
+def test_inkremental_fungsi_campuran(campuran):
+    df, config = campuran
+    flow = FlowInkremental(df, config)
+    edit = df.copy()
+    edit.iloc[10] = np.clip(edit.iloc[10] + 15, 0, 99)
+    edit = edit.drop(edit.index[3])
+    assert flow.sinkronkan(edit) == 'inkremental'
+    phi = flow.hasil()['Net Flow'].reindex(edit.index).to_numpy()
+    np.testing.assert_allclose(phi, net_flow_skalar(edit, config), rtol=0, atol=TOLERANSI)
+    assert flow.periksa_konsistensi() < TOLERANSI
+
+
+def test_preferensi_kolom_per_tipe(campuran):
+    df, config = campuran
+    mk = siapkan_matriks(df, config)
+    D = mk.nilai[:5, None, :] - mk.nilai[None, :, :]
+    hasil = preferensi_kolom(D, mk.fungsi, mk.q, mk.p, mk.s)
+    for j, nama in enumerate(mk.fungsi):
+        np.testing.assert_array_equal(hasil[..., j], preferensi(D[..., j], nama, mk.q[j], mk.p[j], mk.s[j]))
+
+
+def test_fungsi_tidak_dikenal():
+    with pytest.raises(ValueError, match='tidak dikenal'):
+        ambil_fungsi('segitiga')
+    df, config = buat_dataset(5, 2)
+    config['C1']['fungsi'] = 'segitiga'
+    with pytest.raises(ValueError):
+        siapkan_matriks(df, config)
+
+
+def test_fungsi_terdaftar_tanpa_komponen_memakai_pairwise():
+    daftarkan_fungsi('kuadrat', lambda d, q, p, s: np.clip(d / p, 0.0, 1.0) ** 2, ('p',))
+    try:
+        x = np.random.default_rng(4).uniform(0, 50, 40)
+        acuan = (np.clip((x[:, None] - x[None, :]) / 20.0, 0.0, 1.0) ** 2).sum(axis=1)
+        for metode in ('pairwise', 'terurut'):
+            leaving, _ = flow_kriteria(x, 'kuadrat', 0.0, 20.0, 0.0, metode)
+            np.testing.assert_allclose(leaving, acuan, rtol=0, atol=TOLERANSI)
+    finally:
+        del REGISTRI['kuadrat']
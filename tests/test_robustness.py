@@ -0,0 +1,19 @@
+import pytest
+
+from promethee.robustness import AMBANG_PERINGKAT_PENUH, MAKS_PERINGKAT, analisis_robustness
+from promethee.sintetis import buat_dataset
+
+
+@pytest.mark.parametrize('n, maks_peringkat, R', [
+    (30, MAKS_PERINGKAT, 30),
+    (AMBANG_PERINGKAT_PENUH + 20, MAKS_PERINGKAT, MAKS_PERINGKAT),
+    (AMBANG_PERINGKAT_PENUH + 20, None, AMBANG_PERINGKAT_PENUH + 20),
+])
+def test_jumlah_peringkat_akseptabilitas(n, maks_peringkat, R):
+    df, config = buat_dataset(n, 14, seed=0)
+    hasil = analisis_robustness(df.set_index('Nama IUP'), config, n_sampel=200, n_proses=1, maks_peringkat=maks_peringkat)
+    assert hasil.akseptabilitas.shape == (n, R)
+    # Peringkat 1 selalu ditempati tepat satu alternatif per sampel
+    assert hasil.akseptabilitas.iloc[:, 0].sum() == pytest.approx(1.0)
+    if R == n:
+        assert hasil.akseptabilitas.sum(axis=1).to_numpy() == pytest.approx(1.0)
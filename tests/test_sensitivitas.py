@@ -0,0 +1,73 @@
+import threading
+
+import numpy as np
+
+from promethee.cache import ukuran_objek
+from promethee.engine import hitung_promethee
+from promethee.sensitivitas import evaluator_bobot
+from promethee.sintetis import buat_dataset
+
+TOLERANSI = 1e-12
+
+
+def config_bobot_lain(config):
+    lain = {k: dict(v) for k, v in config.items()}
+    lain['C1']['bobot'] *= 5
+    return lain
+
+
+def test_bobot_pemanggil_tidak_saling_menimpa():
+    df, config = buat_dataset(50, 14, seed=7)
+    df = df.set_index('Nama IUP')
+    lain = config_bobot_lain(config)
+    ev_a = evaluator_bobot(df, config)
+    ev_b = evaluator_bobot(df, lain)
+    # Flow unikriteria dibagi, bobot tidak
+    assert ev_a.flow is ev_b.flow
+    assert not np.allclose(ev_a.bobot, ev_b.bobot)
+    for ev, cfg in ((ev_a, config), (ev_b, lain)):
+        acuan = hitung_promethee(df, cfg)
+        np.testing.assert_allclose(ev.hasil().reindex(acuan.index).to_numpy(), acuan.to_numpy(), rtol=0, atol=TOLERANSI)
+
+
+def test_bobot_eksplisit_ke_hasil():
+    df, config = buat_dataset(30, 14, seed=8)
+    df = df.set_index('Nama IUP')
+    lain = config_bobot_lain(config)
+    ev = evaluator_bobot(df, config)
+    bobot_lain = evaluator_bobot(df, lain).bobot
+    acuan = hitung_promethee(df, lain)
+    np.testing.assert_allclose(ev.hasil(bobot_lain).reindex(acuan.index).to_numpy(), acuan.to_numpy(), rtol=0, atol=TOLERANSI)
+    assert (ev.promethee_i(bobot_lain).reindex(acuan.index) == evaluator_bobot(df, lain).promethee_i().reindex(acuan.index)).all().all()
+
+
+def test_akses_bersamaan_banyak_thread():
+    data = []
+    for seed in range(12):
+        df, config = buat_dataset(20, 14, seed=seed)
+        data.append((df.set_index('Nama IUP'), config, config_bobot_lain(config)))
+    galat = []
+
+    def kerja(i):
+        try:
+            for j in range(30):
+                df, config, lain = data[(i + j) % len(data)]
+                cfg = lain if j % 2 else config
+                ev = evaluator_bobot(df, cfg)
+                np.testing.assert_allclose(ev.hasil()['Net Flow'].sort_index().to_numpy(),
+                                           hitung_promethee(df, cfg)['Net Flow'].sort_index().to_numpy(), rtol=0, atol=TOLERANSI)
+        except Exception as e:
+            galat.append(e)
+
+    thread = [threading.Thread(target=kerja, args=(i,)) for i in range(8)]
+    for t in thread:
+        t.start()
+    for t in thread:
+        t.join()
+    assert not galat
+
+
+def test_ukuran_cache_menghitung_array_evaluator():
+    df, config = buat_dataset(300, 20, seed=9)
+    ev = evaluator_bobot(df.set_index('Nama IUP'), config)
+    assert ukuran_objek(ev) >= 3 * 300 * 20 * 8
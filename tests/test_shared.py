@@ -0,0 +1,54 @@
+import numpy as np
+
+from promethee.shared import DatasetStore
+from promethee.sintetis import buat_dataset
+
+
+def test_dataset_identik_dibagi():
+    df, _ = buat_dataset(50, 14, seed=0)
+    store = DatasetStore()
+    a, b = store.daftarkan(df), store.daftarkan(df.copy())
+    assert a.entri is b.entri
+    assert a.entri.nilai.dtype == np.float32  # skor bulat dipadatkan tanpa kehilangan nilai
+    np.testing.assert_array_equal(a.frame().to_numpy(), df.iloc[:, 1:].to_numpy())
+
+
+def test_editan_desimal_tidak_dipotong_float32():
+    df, _ = buat_dataset(100, 14, seed=1)
+    handle = DatasetStore().daftarkan(df)
+    editor = handle.frame_editor()
+    editor.iloc[3, 1] = 12.3
+    assert handle.terapkan(editor) == 'overlay'
+    assert handle.frame().iloc[3, 0] == 12.3
+    assert not handle.frame_basis().iloc[3, 0] == 12.3
+
+
+def test_presisi_sama_untuk_overlay_dan_pisah():
+    df, _ = buat_dataset(100, 14, seed=2)
+    store = DatasetStore()
+    kecil, besar = store.daftarkan(df), store.daftarkan(df)
+    editor = kecil.frame_editor()
+    editor.iloc[5, 2] = 33.3
+    assert kecil.terapkan(editor) == 'overlay'
+    editor = besar.frame_editor()
+    editor.iloc[:40, 2] = 33.3
+    assert besar.terapkan(editor) == 'pisah'
+    assert kecil.frame().iloc[5, 1] == besar.frame().iloc[5, 1] == 33.3
+    # Dataset bersama lain tidak ikut berubah
+    assert store.daftarkan(df).frame().iloc[5, 1] == df.iloc[5, 2]
+
+
+def test_state_sesi_dihitung_ke_anggaran():
+    df, _ = buat_dataset(100, 14, seed=3)
+    store = DatasetStore()
+    handle = store.daftarkan(df)
+    store.maks_bytes = store.total_bytes + 1000
+    assert handle.pesan_state(800)
+    assert store.statistik()['bytes_sesi'] == 800
+    # Pesanan baru menggantikan yang lama; yang tidak muat ditolak tanpa mengubah total
+    total = store.total_bytes
+    assert not handle.pesan_state(2000)
+    assert store.total_bytes == total - 800 and store.bytes_sesi == 0
+    assert handle.pesan_state(500)
+    del handle
+    assert store.bytes_sesi == 0